@@ -1,5 +1,7 @@
 import random
 
+import road_tables
+
 
 class PlayerType:
     NoPlayer = 0
@@ -12,6 +14,27 @@ class PieceType:
     Standing = 1
 
 
+class ActionKind:
+    Place = 0
+    Move = 1
+
+
+# actiunile din motor sunt intregi: tip << 12 | celula sursa << 6 | argument,
+# argumentul fiind tipul piesei la plasare sau celula tinta la mutare
+def encode_action(kind, source, argument):
+    return kind << 12 | source << 6 | argument
+
+
+def decode_action(action):
+    return action >> 12, (action >> 6) & 0x3F, action & 0x3F
+
+
+def action_target(action):
+    if action >> 12 == ActionKind.Place:
+        return (action >> 6) & 0x3F
+    return action & 0x3F
+
+
 class Move:
     def __init__(self, piece_id, new_x, new_y):
         self.piece_id = piece_id
@@ -28,331 +51,877 @@ class Piece:
         self.type = type
 
     def valid_moves(self, current_board):
-        moves_list = []
-        for i, j in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            if self.is_valid_move(current_board, Move(self.id, self.x + i, self.y + j)):
-                moves_list.append(Move(self.id, self.x + i, self.y + j))
-        return moves_list
+        return current_board.piece_moves(self.id)
 
     def is_valid_move(self, current_board, move):
-        piece = None
-        for p in current_board.pieces:
-            if p.id == move.piece_id:
-                piece = p
-        if piece is None:
-            return False
-        if piece.type == PieceType.Standing:
-            return False
-        if move.new_x != piece.x and move.new_y != piece.y:
-            return False
-        if move.new_x == piece.x and move.new_y == piece.y:
-            return False
-        if abs(move.new_x - piece.x) + abs(move.new_y - piece.y) != 1:
-            return False
+        return current_board.is_legal_move(move)
 
-        top_piece = current_board.get_top_piece(piece.x, piece.y)
-        if top_piece is None or top_piece.id != piece.id:
-            return False
 
-        target_top_piece = current_board.get_top_piece(move.new_x, move.new_y)
+class BitGeometry:
+    _cache = {}
 
-        if target_top_piece is not None and target_top_piece.type == PieceType.Standing:
-            return False
+    def __init__(self, size):
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+        # bitul unei celule este x * size + y
+        self.first_x = (1 << size) - 1
+        self.last_x = self.first_x << (size * (size - 1))
+        self.first_y = 0
+        for x in range(size):
+            self.first_y |= 1 << (x * size)
+        self.last_y = self.first_y << (size - 1)
+        self.center = 0
+        for x, y in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+            if x < size and y < size:
+                self.center |= 1 << (x * size + y)
+        self.road_table = None
+        self.neighbour_masks = [self.neighbours(1 << cell) for cell in range(size * size)]
+        self.edge_flags = []
+        for cell in range(size * size):
+            x, y = divmod(cell, size)
+            flags = 0
+            if x == 0: flags |= RoadNetwork.FirstX
+            if x == size - 1: flags |= RoadNetwork.LastX
+            if y == 0: flags |= RoadNetwork.FirstY
+            if y == size - 1: flags |= RoadNetwork.LastY
+            self.edge_flags.append(flags)
+
+    @staticmethod
+    def of(size):
+        geometry = BitGeometry._cache.get(size)
+        if geometry is None:
+            geometry = BitGeometry(size)
+            geometry.road_table = road_tables.load(geometry)
+            BitGeometry._cache[size] = geometry
+        return geometry
+
+    def neighbours(self, mask):
+        size = self.size
+        grown = (mask << size) | (mask >> size)
+        grown |= (mask << 1) & ~self.first_y
+        grown |= (mask >> 1) & ~self.last_y
+        return grown & self.full
+
+    def flood(self, seed, allowed):
+        region = seed & allowed
+        while True:
+            grown = (region | self.neighbours(region)) & allowed
+            if grown == region:
+                return region
+            region = grown
+
+    def has_road(self, mask):
+        if self.flood(mask & self.first_y, mask) & self.last_y:
+            return True
+        return bool(self.flood(mask & self.first_x, mask) & self.last_x)
+
+    def road_in(self, mask):
+        if self.road_table is not None:
+            return self.road_table[mask] >= road_tables.ROAD_FLAG
+        return self.has_road(mask)
+
+    def longest_road(self, mask):
+        max_len = 0
+        while mask:
+            component = self.flood(mask & -mask, mask)
+            mask &= ~component
+            length = component.bit_count()
+            if length > max_len:
+                max_len = length
+        return max_len
+
+
+
+class RoadNetwork:
+    # union-find peste flat-urile din varf ale unui jucator
+    FirstX = 1
+    LastX = 2
+    FirstY = 4
+    LastY = 8
+
+    def __init__(self, geometry):
+        cells = geometry.size * geometry.size
+        self.geometry = geometry
+        self.parent = [0] * cells
+        self.count = [0] * cells
+        self.edges = [0] * cells
+        self.members = 0
+        self.longest = 0
+        self.road = False
+
+    def copy(self):
+        network = RoadNetwork.__new__(RoadNetwork)
+        network.geometry = self.geometry
+        network.parent = self.parent[:]
+        network.count = self.count[:]
+        network.edges = self.edges[:]
+        network.members = self.members
+        network.longest = self.longest
+        network.road = self.road
+        return network
+
+    def find(self, cell):
+        parent = self.parent
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    def _union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        count = self.count
+        if count[root_a] < count[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        count[root_a] += count[root_b]
+        edges = self.edges[root_a] | self.edges[root_b]
+        self.edges[root_a] = edges
+        if count[root_a] > self.longest:
+            self.longest = count[root_a]
+        if edges & 3 == 3 or edges & 12 == 12:
+            self.road = True
+
+    def add(self, cell):
+        self.parent[cell] = cell
+        self.count[cell] = 1
+        edges = self.geometry.edge_flags[cell]
+        self.edges[cell] = edges
+        if self.longest == 0:
+            self.longest = 1
+        if edges & 3 == 3 or edges & 12 == 12:
+            self.road = True
+        linked = self.geometry.neighbour_masks[cell] & self.members
+        self.members |= 1 << cell
+        while linked:
+            bit = linked & -linked
+            linked ^= bit
+            self._union(cell, bit.bit_length() - 1)
+
+    def remove(self, removed):
+        roots = set()
+        pending = removed
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            roots.add(self.find(bit.bit_length() - 1))
+
+        affected = 0
+        pending = self.members
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            if self.find(bit.bit_length() - 1) in roots:
+                affected |= bit
+
+        # componentele atinse se reconstruiesc din celulele ramase
+        self.members &= ~affected
+        rebuilt = affected & ~removed
+        while rebuilt:
+            bit = rebuilt & -rebuilt
+            rebuilt ^= bit
+            self.add(bit.bit_length() - 1)
+
+        self.longest = 0
+        self.road = False
+        pending = self.members
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            cell = bit.bit_length() - 1
+            if self.parent[cell] == cell:
+                if self.count[cell] > self.longest:
+                    self.longest = self.count[cell]
+                edges = self.edges[cell]
+                if edges & 3 == 3 or edges & 12 == 12:
+                    self.road = True
+
+
+class Zobrist:
+    _cache = {}
+    MAX_HEIGHT = 32
+    MAX_RESERVE = 16
+    SEED = 0x7A4B
+
+    def __init__(self, size):
+        rng = random.Random(self.SEED + size)
+        cells = size * size
+        self.pieces = [rng.getrandbits(64) for _ in range(cells * self.MAX_HEIGHT * 4)]
+        self.reserves = [rng.getrandbits(64) for _ in range(4 * self.MAX_RESERVE)]
+        self.side = rng.getrandbits(64)
+
+    @staticmethod
+    def of(size):
+        zobrist = Zobrist._cache.get(size)
+        if zobrist is None:
+            zobrist = Zobrist(size)
+            Zobrist._cache[size] = zobrist
+        return zobrist
+
+    def piece(self, cell, level, player, piece_type):
+        return self.pieces[((cell * self.MAX_HEIGHT + level) * 2 + player - 1) * 2 + piece_type]
+
+    def reserve(self, player, piece_type, count):
+        return self.reserves[((player - 1) * 2 + piece_type) * self.MAX_RESERVE + count]
+
+
+class PositionSummary:
+
+    def __init__(self, board):
+        geometry = board.geometry
+        computer_flats = board.flats[PlayerType.Computer]
+        human_flats = board.flats[PlayerType.Human]
+
+        self.computer_flats = computer_flats.bit_count()
+        self.human_flats = human_flats.bit_count()
+        self.computer_center = (computer_flats & geometry.center).bit_count()
+        self.human_center = (human_flats & geometry.center).bit_count()
+        road_table = geometry.road_table
+        if road_table is not None:
+            computer_entry = road_table[computer_flats]
+            human_entry = road_table[human_flats]
+            self.computer_road = computer_entry & road_tables.LENGTH_MASK
+            self.human_road = human_entry & road_tables.LENGTH_MASK
+            self.computer_has_road = computer_entry >= road_tables.ROAD_FLAG
+            self.human_has_road = human_entry >= road_tables.ROAD_FLAG
+        else:
+            computer_roads = board.roads[PlayerType.Computer]
+            human_roads = board.roads[PlayerType.Human]
+            self.computer_road = computer_roads.longest
+            self.human_road = human_roads.longest
+            self.computer_has_road = computer_roads.road
+            self.human_has_road = human_roads.road
+        self.full = board.occupied == geometry.full
+
+        material = 10 * (self.computer_flats - self.human_flats)
+        material += 5 * (self.computer_center - self.human_center)
+        material += 20 * (self.computer_road - self.human_road)
+
+        if self.computer_has_road:
+            self.finished, self.winner = True, PlayerType.Computer
+        elif self.human_has_road:
+            self.finished, self.winner = True, PlayerType.Human
+        elif self.full:
+            self.finished = True
+            self.winner = PlayerType.Computer if material > 0 else PlayerType.Human
+        else:
+            self.finished, self.winner = False, PlayerType.NoPlayer
 
-        return current_board.size > move.new_x >= 0 and current_board.size > move.new_y >= 0
+        if not self.finished:
+            self.score = material
+        elif self.winner == PlayerType.Computer:
+            self.score = 100000
+        else:
+            self.score = -100000
 
 
 class Board:
     def __init__(self, board=None):
         if board is None:
             self.size = 4
-            self.pieces = []
+            self.stacks = [[] for _ in range(self.size * self.size)]
+            self.piece_owner = []
+            self.piece_type = []
+            self.piece_cell = []
             self.next_piece_id = 0
             self.available_pieces = {
                 PlayerType.Human: {PieceType.Flat: 13, PieceType.Standing: 2},
                 PlayerType.Computer: {PieceType.Flat: 13, PieceType.Standing: 2}
             }
+            self.geometry = BitGeometry.of(self.size)
+            self.flats = {PlayerType.Human: 0, PlayerType.Computer: 0}
+            self.walls = {PlayerType.Human: 0, PlayerType.Computer: 0}
+            self.occupied = 0
+            self.zobrist = Zobrist.of(self.size)
+            self.hash = self.compute_hash()
+            self._summary = None
+            self.roads = None
+            if self.geometry.road_table is None:
+                self.roads = {
+                    PlayerType.Human: RoadNetwork(self.geometry),
+                    PlayerType.Computer: RoadNetwork(self.geometry)
+                }
         else:
             self.size = board.size
-            self.pieces = [Piece(p.x, p.y, p.id, p.player, p.type) for p in board.pieces]
+            self.stacks = [list(stack) for stack in board.stacks]
+            self.piece_owner = list(board.piece_owner)
+            self.piece_type = list(board.piece_type)
+            self.piece_cell = list(board.piece_cell)
             self.next_piece_id = board.next_piece_id
             self.available_pieces = {
                 PlayerType.Human: dict(board.available_pieces[PlayerType.Human]),
                 PlayerType.Computer: dict(board.available_pieces[PlayerType.Computer])
             }
+            self.geometry = board.geometry
+            self.flats = dict(board.flats)
+            self.walls = dict(board.walls)
+            self.occupied = board.occupied
+            self.zobrist = board.zobrist
+            self.hash = board.hash
+            self._summary = board._summary
+            self.roads = dict(board.roads) if board.roads is not None else None
+
+    def __getstate__(self):
+        # geometria tine tabela mapata in memorie, asa ca o refacem la despachetare
+        state = dict(self.__dict__)
+        for name in ('geometry', 'zobrist', 'roads', '_summary'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.geometry = BitGeometry.of(self.size)
+        self.zobrist = Zobrist.of(self.size)
+        self._summary = None
+        self.roads = None if self.geometry.road_table is not None else {}
+        self.rebuild_masks()
 
-    def get_top_piece(self, x, y):
-        top_piece = None
-        max_id = -1
-        for p in self.pieces:
-            if p.x == x and p.y == y and p.id > max_id:
-                max_id = p.id
-                top_piece = p
-        return top_piece
-
-    def is_position_empty(self, x, y):
-        return self.get_top_piece(x, y) is None
-
-    def evaluation_function(self):
-        fin, win = self.check_finish()
-        if fin:
-            if win == PlayerType.Computer:
-                return 100000
-            elif win == PlayerType.Human:
-                return -100000
-
-        score = 0
+    @staticmethod
+    def from_stacks(size, stacks, available_pieces):
+        # stacks: pentru fiecare celula, lista de (proprietar, tip) de jos in sus; id-urile pieselor
+        # se dau in ordinea celulelor
+        board = Board.__new__(Board)
+        state = {
+            'size': size,
+            'stacks': [],
+            'piece_owner': [],
+            'piece_type': [],
+            'piece_cell': [],
+            'next_piece_id': 0,
+            'available_pieces': {player: dict(reserve) for player, reserve in available_pieces.items()},
+            'hash': 0,
+        }
+        for cell, pieces in enumerate(stacks):
+            stack = []
+            for owner, piece_type in pieces:
+                stack.append(state['next_piece_id'])
+                state['piece_owner'].append(owner)
+                state['piece_type'].append(piece_type)
+                state['piece_cell'].append(cell)
+                state['next_piece_id'] += 1
+            state['stacks'].append(stack)
+        board.__setstate__(state)
+        board.hash = board.compute_hash()
+        return board
+
+    @property
+    def pieces(self):
+        return [self._piece_view(piece_id) for piece_id in range(self.next_piece_id)]
+
+    def _piece_view(self, piece_id):
+        x, y = divmod(self.piece_cell[piece_id], self.size)
+        return Piece(x, y, piece_id, self.piece_owner[piece_id], self.piece_type[piece_id])
+
+    def cell_bit(self, x, y):
+        return 1 << (x * self.size + y)
+
+    def compute_hash(self):
+        key = 0
+        for cell, stack in enumerate(self.stacks):
+            for level, piece_id in enumerate(stack):
+                key ^= self.zobrist.piece(cell, level, self.piece_owner[piece_id], self.piece_type[piece_id])
+        for player, reserve in self.available_pieces.items():
+            for piece_type, count in reserve.items():
+                key ^= self.zobrist.reserve(player, piece_type, count)
+        return key
+
+    def zobrist_key(self, player):
+        if player == PlayerType.Human:
+            return self.hash ^ self.zobrist.side
+        return self.hash
+
+    def rebuild_masks(self):
+        self.flats = {PlayerType.Human: 0, PlayerType.Computer: 0}
+        self.walls = {PlayerType.Human: 0, PlayerType.Computer: 0}
+        self.occupied = 0
+        self._summary = None
+        for cell in range(self.size * self.size):
+            self._refresh_cell(cell)
+        if self.roads is None:
+            return
+        for player in (PlayerType.Human, PlayerType.Computer):
+            network = RoadNetwork(self.geometry)
+            flats = self.flats[player]
+            while flats:
+                bit = flats & -flats
+                flats ^= bit
+                network.add(bit.bit_length() - 1)
+            self.roads[player] = network
+
+    def _update_roads(self, player, old_flats):
+        new_flats = self.flats[player]
+        if new_flats == old_flats or self.roads is None:
+            return
+        network = self.roads[player].copy()
+        removed = old_flats & ~new_flats
+        if removed:
+            network.remove(removed)
+        added = new_flats & ~old_flats
+        while added:
+            bit = added & -added
+            added ^= bit
+            network.add(bit.bit_length() - 1)
+        self.roads[player] = network
+
+    def _refresh_cell(self, cell):
+        bit = 1 << cell
+        flats, walls = self.flats, self.walls
+        if self.occupied & bit:
+            for player in (PlayerType.Human, PlayerType.Computer):
+                flats[player] &= ~bit
+                walls[player] &= ~bit
+            self.occupied ^= bit
+        stack = self.stacks[cell]
+        if not stack:
+            return
+        top_id = stack[-1]
+        self.occupied |= bit
+        if self.piece_type[top_id] == PieceType.Flat:
+            flats[self.piece_owner[top_id]] |= bit
+        else:
+            walls[self.piece_owner[top_id]] |= bit
 
-        computer_flats = 0
-        human_flats = 0
+    def get_piece(self, piece_id):
+        if not 0 <= piece_id < self.next_piece_id:
+            return None
+        return self._piece_view(piece_id)
 
-        center_coords = [(1, 1), (1, 2), (2, 1), (2, 2)]
+    def get_stack(self, x, y):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return []
+        return [self._piece_view(piece_id) for piece_id in self.stacks[x * self.size + y]]
 
-        for x in range(self.size):
-            for y in range(self.size):
-                p = self.get_top_piece(x, y)
-                if p:
-                    val = 10
-                    if (x, y) in center_coords:
-                        val += 5
+    def get_top_piece(self, x, y):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return None
+        stack = self.stacks[x * self.size + y]
+        if not stack:
+            return None
+        return self._piece_view(stack[-1])
 
-                    if p.player == PlayerType.Computer:
-                        if p.type == PieceType.Flat:
-                            computer_flats += val
-                    elif p.player == PlayerType.Human:
-                        if p.type == PieceType.Flat:
-                            human_flats += val
+    def is_position_empty(self, x, y):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return True
+        return not self.occupied & self.cell_bit(x, y)
 
-        score += (computer_flats - human_flats)
+    def is_top_standing(self, x, y):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        bit = self.cell_bit(x, y)
+        return bool((self.walls[PlayerType.Human] | self.walls[PlayerType.Computer]) & bit)
 
-        computer_road = self.longest_road_length(PlayerType.Computer)
-        human_road = self.longest_road_length(PlayerType.Human)
+    def player_mask(self, player):
+        return self.flats[player] | self.walls[player]
 
-        score += (computer_road * 20) - (human_road * 20)
+    def summary(self):
+        if self._summary is None:
+            self._summary = PositionSummary(self)
+        return self._summary
 
-        return score
+    def evaluation_function(self):
+        return self.summary().score
 
     def longest_road_length(self, player):
-        player_top_flats = set()
-        for x in range(self.size):
-            for y in range(self.size):
-                p = self.get_top_piece(x, y)
-                if p is not None and p.player == player and p.type == PieceType.Flat:
-                    player_top_flats.add((x, y))
-
-        if not player_top_flats:
-            return 0
+        if self.roads is None:
+            return self.geometry.road_table[self.flats[player]] & road_tables.LENGTH_MASK
+        return self.roads[player].longest
 
-        visited = set()
-        max_len = 0
+    def move_to_action(self, move):
+        # actiunea pentru o mutare din UI; None daca piesa nu e in varful stivei sau tinta e in afara tablei
+        if move is None or not 0 <= move.piece_id < self.next_piece_id:
+            return None
+        if not (0 <= move.new_x < self.size and 0 <= move.new_y < self.size):
+            return None
+        source = self.piece_cell[move.piece_id]
+        if self.stacks[source][-1] != move.piece_id:
+            return None
+        return encode_action(ActionKind.Move, source, move.new_x * self.size + move.new_y)
 
-        for start_node in player_top_flats:
-            if start_node not in visited:
-                q = [start_node]
-                local_visited = {start_node}
-                count = 0
-                while q:
-                    cx, cy = q.pop(0)
-                    count += 1
-                    visited.add((cx, cy))
-
-                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nx, ny = cx + dx, cy + dy
-                        if (nx, ny) in player_top_flats and (nx, ny) not in local_visited:
-                            local_visited.add((nx, ny))
-                            q.append((nx, ny))
-
-                if count > max_len:
-                    max_len = count
+    def is_legal_move(self, move):
+        action = self.move_to_action(move)
+        return action is not None and self.is_legal(action, self.piece_owner[move.piece_id])
 
-        return max_len
+    def can_place(self, x, y, player, piece_type):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        return self.is_legal(encode_action(ActionKind.Place, x * self.size + y, piece_type), player)
 
     def make_move(self, move):
-        next_board = Board(self)
-        if move is not None:
-            mover = next((p for p in next_board.pieces if p.id == move.piece_id), None)
-
-            if mover is not None:
-                start_x, start_y = mover.x, mover.y
-                target_x, target_y = move.new_x, move.new_y
-
-                moving_stack = [p for p in next_board.pieces if p.x == start_x and p.y == start_y]
-                moving_stack.sort(key=lambda p: p.id)
-
-                target_stack = [p for p in next_board.pieces if p.x == target_x and p.y == target_y]
-
-                max_dest_id = -1
-                if target_stack:
-                    max_dest_id = max(p.id for p in target_stack)
-
-                base_new_id = max(max_dest_id, next_board.next_piece_id - 1) + 1
-
-                for p in moving_stack:
-                    p.x = target_x
-                    p.y = target_y
-                    p.id = base_new_id
-                    base_new_id += 1
-
-                next_board.next_piece_id = base_new_id
-
-        return next_board
+        action = self.move_to_action(move)
+        if action is None:
+            return Board(self)
+        return self.apply_action(action, None)
 
     def place_piece(self, x, y, player, piece_type):
-        if not (0 <= x < self.size and 0 <= y < self.size):
-            return None
-        if self.available_pieces[player][piece_type] <= 0:
-            return None
-        if not self.is_position_empty(x, y):
+        if not self.can_place(x, y, player, piece_type):
             return None
+        return self.apply_action(encode_action(ActionKind.Place, x * self.size + y, piece_type), player)
+
+    # regulile de mutare sunt definite doar aici; motorul, UI-ul si perft folosesc aceleasi metode
+    def placement_cells(self):
+        # piesele noi se pun doar pe celule goale
+        return self.geometry.full & ~self.occupied
+
+    def move_targets(self, cell):
+        # o stiva se muta cu o celula, pe orice celula care nu are un perete deasupra
+        return self.geometry.neighbour_masks[cell] & ~(self.walls[PlayerType.Human] | self.walls[PlayerType.Computer])
+
+    def generate_actions(self, player):
+        reserve = self.available_pieces[player]
+        flat_left = reserve[PieceType.Flat] > 0
+        standing_left = reserve[PieceType.Standing] > 0
+        if flat_left or standing_left:
+            empty = self.placement_cells()
+            while empty:
+                bit = empty & -empty
+                empty ^= bit
+                code = (bit.bit_length() - 1) << 6
+                if flat_left:
+                    yield code | PieceType.Flat
+                if standing_left:
+                    yield code | PieceType.Standing
+
+        # doar stivele cu o piesa culcata a jucatorului deasupra se pot muta
+        movable = self.flats[player]
+        while movable:
+            bit = movable & -movable
+            movable ^= bit
+            cell = bit.bit_length() - 1
+            code = ActionKind.Move << 12 | cell << 6
+            targets = self.move_targets(cell)
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                yield code | (target.bit_length() - 1)
+
+    def legal_actions(self, player):
+        return list(self.generate_actions(player))
+
+    def is_legal(self, action, player):
+        kind, source, argument = decode_action(action)
+        cells = self.size * self.size
+        if source >= cells:
+            return False
+        if kind == ActionKind.Place:
+            if argument not in (PieceType.Flat, PieceType.Standing):
+                return False
+            return self.available_pieces[player][argument] > 0 and bool(self.placement_cells() >> source & 1)
+        if kind != ActionKind.Move or argument >= cells:
+            return False
+        if not self.flats[player] >> source & 1:
+            return False
+        return bool(self.move_targets(source) >> argument & 1)
+
+    def piece_moves(self, piece_id):
+        if not 0 <= piece_id < self.next_piece_id:
+            return []
+        cell = self.piece_cell[piece_id]
+        player = self.piece_owner[piece_id]
+        if self.stacks[cell][-1] != piece_id or not self.flats[player] >> cell & 1:
+            return []
+        moves = []
+        targets = self.move_targets(cell)
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            new_x, new_y = divmod(target.bit_length() - 1, self.size)
+            moves.append(Move(piece_id, new_x, new_y))
+        return moves
+
+    def do_action(self, action, player):
+        kind, source, argument = action >> 12, (action >> 6) & 0x3F, action & 0x3F
+        zobrist = self.zobrist
+        old_hash = self.hash
+        old_summary = self._summary
+        self._summary = None
+        old_roads = self.roads
+        if old_roads is not None:
+            self.roads = dict(old_roads)
+        if kind == ActionKind.Place:
+            reserve = self.available_pieces[player]
+            count = reserve[argument]
+            self.hash ^= (zobrist.piece(source, len(self.stacks[source]), player, argument)
+                          ^ zobrist.reserve(player, argument, count)
+                          ^ zobrist.reserve(player, argument, count - 1))
+            self.stacks[source].append(self.next_piece_id)
+            self.piece_owner.append(player)
+            self.piece_type.append(argument)
+            self.piece_cell.append(source)
+            self.next_piece_id += 1
+            reserve[argument] = count - 1
+            old_flats = self.flats[player]
+            self._refresh_cell(source)
+            self._update_roads(player, old_flats)
+            return (ActionKind.Place, source, argument, player, old_hash, old_summary, old_roads)
+
+        moving_stack = self.stacks[source]
+        target_stack = self.stacks[argument]
+        key = self.hash
+        base = len(target_stack)
+        for level, piece_id in enumerate(moving_stack):
+            owner = self.piece_owner[piece_id]
+            piece_type = self.piece_type[piece_id]
+            key ^= zobrist.piece(source, level, owner, piece_type) ^ zobrist.piece(argument, base + level, owner, piece_type)
+            self.piece_cell[piece_id] = argument
+        self.hash = key
+        self.stacks[source] = []
+        target_stack.extend(moving_stack)
+        old_human, old_computer = self.flats[PlayerType.Human], self.flats[PlayerType.Computer]
+        self._refresh_cell(source)
+        self._refresh_cell(argument)
+        self._update_roads(PlayerType.Human, old_human)
+        self._update_roads(PlayerType.Computer, old_computer)
+        return (ActionKind.Move, source, argument, len(moving_stack), old_hash, old_summary, old_roads)
+
+    def undo_action(self, undo):
+        kind, source, argument, extra, old_hash, old_summary, old_roads = undo
+        self.hash = old_hash
+        self._summary = old_summary
+        self.roads = old_roads
+        if kind == ActionKind.Place:
+            self.stacks[source].pop()
+            self.piece_owner.pop()
+            self.piece_type.pop()
+            self.piece_cell.pop()
+            self.next_piece_id -= 1
+            self.available_pieces[extra][argument] += 1
+            self._refresh_cell(source)
+            return
+
+        target_stack = self.stacks[argument]
+        moving_stack = target_stack[-extra:]
+        del target_stack[-extra:]
+        self.stacks[source] = moving_stack
+        for piece_id in moving_stack:
+            self.piece_cell[piece_id] = source
+        self._refresh_cell(source)
+        self._refresh_cell(argument)
+
+    def apply_action(self, action, player):
+        next_board = Board(self)
+        next_board.do_action(action, player)
+        return next_board
 
-        new_board = Board(self)
-        new_piece = Piece(x, y, new_board.next_piece_id, player, piece_type)
-        new_board.pieces.append(new_piece)
-        new_board.next_piece_id += 1
-        new_board.available_pieces[player][piece_type] -= 1
-        return new_board
+    def action_to_move(self, action):
+        kind, source, argument = decode_action(action)
+        if kind != ActionKind.Move:
+            return None
+        new_x, new_y = divmod(argument, self.size)
+        return Move(self.stacks[source][-1], new_x, new_y)
 
     def has_pieces_available(self, player):
         return any(count > 0 for count in self.available_pieces[player].values())
 
     def has_road(self, player):
-        size = self.size
-        player_flats = set()
-
-        for x in range(size):
-            for y in range(size):
-                p = self.get_top_piece(x, y)
-                if p is not None and p.player == player and p.type == PieceType.Flat:
-                    player_flats.add((x, y))
-
-        if not player_flats:
-            return False
-
-        def check_connection(start_nodes, is_vertical):
-            visited = set()
-            queue = list(start_nodes)
-            visited.update(start_nodes)
-
-            while queue:
-                cx, cy = queue.pop(0)
+        if self.roads is None:
+            return self.geometry.road_table[self.flats[player]] >= road_tables.ROAD_FLAG
+        return self.roads[player].road
 
-                if is_vertical:
-                    if cy == size - 1: return True
-                else:
-                    if cx == size - 1: return True
-
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nx, ny = cx + dx, cy + dy
-                    if (nx, ny) in player_flats and (nx, ny) not in visited:
-                        visited.add((nx, ny))
-                        queue.append((nx, ny))
-            return False
-
-        start_vertical = [node for node in player_flats if node[1] == 0]
-        if start_vertical and check_connection(start_vertical, is_vertical=True):
-            return True
-
-        start_horizontal = [node for node in player_flats if node[0] == 0]
-        if start_horizontal and check_connection(start_horizontal, is_vertical=False):
-            return True
-
-        return False
+    def road_threats(self, player):
+        # celulele libere in care o piesa culcata a jucatorului ar completa un drum
+        if self.available_pieces[player][PieceType.Flat] <= 0:
+            return 0
+        geometry = self.geometry
+        flats = self.flats[player]
+        # un drum are cel putin `size` piese, deci lipsind una trebuie sa existe size - 1
+        if flats.bit_count() < self.size - 1:
+            return 0
+        empty = geometry.full & ~self.occupied
+        if not geometry.road_in(flats | empty):
+            return 0
+        # piesa care completeaza drumul e vecina cu una din piesele lui
+        candidates = empty & geometry.neighbours(flats)
+        road_in = geometry.road_in
+        threats = 0
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            if road_in(flats | bit):
+                threats |= bit
+        return threats
+
+    def winning_moves(self, player):
+        # mutarile de stiva care completeaza un drum; mutarea nu adauga piese pe tabla
+        flats = self.flats[player]
+        if flats.bit_count() < self.size:
+            return []
+        geometry = self.geometry
+        blocked = self.walls[PlayerType.Human] | self.walls[PlayerType.Computer]
+        if not geometry.road_in(flats | (geometry.neighbours(flats) & ~blocked)):
+            return []
+        road_in = geometry.road_in
+        moves = []
+        movable = flats
+        while movable:
+            bit = movable & -movable
+            movable ^= bit
+            cell = bit.bit_length() - 1
+            remaining = flats ^ bit
+            targets = self.move_targets(cell)
+            if not road_in(remaining | targets):
+                continue
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                if road_in(remaining | target):
+                    moves.append(ActionKind.Move << 12 | cell << 6 | (target.bit_length() - 1))
+        return moves
+
+    def winning_actions(self, player):
+        actions = []
+        threats = self.road_threats(player)
+        while threats:
+            bit = threats & -threats
+            threats ^= bit
+            actions.append((bit.bit_length() - 1) << 6 | PieceType.Flat)
+        return actions + self.winning_moves(player)
+
+    def threatened_cells(self, player):
+        # celulele pe care trebuie sa le ocupe adversarul ca sa opreasca un drum dintr-o mutare
+        cells = self.road_threats(player)
+        for action in self.winning_moves(player):
+            cells |= (1 << ((action >> 6) & 0x3F)) | (1 << (action & 0x3F))
+        return cells
 
     def check_finish(self):
-        if self.has_road(PlayerType.Computer):
-            return True, PlayerType.Computer
-        if self.has_road(PlayerType.Human):
-            return True, PlayerType.Human
-
-        empty_spots = False
-        for x in range(self.size):
-            for y in range(self.size):
-                if self.get_top_piece(x, y) is None:
-                    empty_spots = True
-                    break
-
-        if not empty_spots:
-            score = self.evaluation_function()
-            return True, (PlayerType.Computer if score > 0 else PlayerType.Human)
+        summary = self.summary()
+        return summary.finished, summary.winner
 
-        return False, PlayerType.NoPlayer
+    def next_boards(self, player):
+        # fiecare tabla urmatoare se construieste abia cand e ceruta
+        for action in self.generate_actions(player):
+            yield action, self.apply_action(action, player)
 
     def get_all_possible_next_boards(self, player):
-        next_boards = []
+        return [board for action, board in self.next_boards(player)]
 
-        if self.has_pieces_available(player):
-            for x in range(self.size):
-                for y in range(self.size):
-                    if self.is_position_empty(x, y):
-                        if self.available_pieces[player][PieceType.Flat] > 0:
-                            nb = self.place_piece(x, y, player, PieceType.Flat)
-                            if nb: next_boards.append(nb)
-                        if self.available_pieces[player][PieceType.Standing] > 0:
-                            nb = self.place_piece(x, y, player, PieceType.Standing)
-                            if nb: next_boards.append(nb)
 
-        my_pieces = [p for p in self.pieces if p.player == player]
-        for p in my_pieces:
-            moves = p.valid_moves(self)
-            for move in moves:
-                nb = self.make_move(move)
-                if nb: next_boards.append(nb)
-
-        return next_boards
+# tabela de drumuri pentru tabla standard se incarca la import
+BitGeometry.of(4)
 
 
 class Minimax:
+    table = None
+    # ordonarea (killer, istoric) se pastreaza intre mutari, ca si tabela
+    ordering = None
+    parallel = None
+    # cautarea in timpul adversarului, vezi start_pondering
+    ponderer = None
+    # rezultatul ultimei cautari, pentru statistici
+    last_result = None
+    # False revine la alfa-beta clasic, pentru comparatii
+    pvs = True
+    aspiration = True
+    # cautare selectiva; oprite implicit, vezi `python -m engine.benchmark selfplay`
+    null_move = False
+    lmr = False
+    quiescence = True
 
     @staticmethod
-    def find_next_board(current_board, depth=3, alpha=float('-inf'), beta=float('inf'), maximizing=True):
-        finished, winner = current_board.check_finish()
-        if finished or depth == 0:
-            return current_board
-
-        best_board = None
-
-        if maximizing:
-            max_eval = float('-inf')
-            possible_boards = current_board.get_all_possible_next_boards(PlayerType.Computer)
-
-            if not possible_boards:
-                return current_board
+    def find_best_result(current_board, depth=3, maximizing=True, time_budget=None,
+                         alpha=float('-inf'), beta=float('inf'), workers=1, parallel_mode='root',
+                         on_iteration=None, stop=None, max_nodes=None):
+        player = PlayerType.Computer if maximizing else PlayerType.Human
+        # cautarea in fundal foloseste aceeasi tabela, trebuie oprita inainte
+        ponder_hit = Minimax.stop_pondering(current_board, player)
+
+        if workers is not None and workers > 1:
+            Minimax._ensure_parallel(workers, parallel_mode)
+            Minimax.parallel.options = Minimax.search_options()
+            Minimax.last_result = Minimax.parallel.iterative_deepening(current_board, player, depth, time_budget,
+                                                                       stop, on_iteration)
+            return Minimax.last_result
+
+        search = Minimax._create_search(current_board)
+        search.on_iteration = on_iteration
+        # stop e un threading.Event; la oprire se intoarce ultima iteratie completa
+        search.stop = stop
+        # limita de noduri se aplica doar cautarii seriale
+        search.max_nodes = max_nodes
+        if time_budget is not None or stop is not None or on_iteration is not None or max_nodes is not None:
+            score, action = search.iterative_deepening(player, depth, time_budget)
+        else:
+            score, action = search.search(depth, player, alpha, beta)
+        Minimax.last_result = search.result(score, action, player)
+        if Minimax.ponderer is not None:
+            Minimax.last_result.stats.update(Minimax.ponderer.statistics(), ponder_hit=ponder_hit)
+        return Minimax.last_result
 
-            for next_board_state in possible_boards:
-                result = Minimax.find_next_board(
-                    next_board_state, depth - 1, alpha, beta, False
-                )
-                eval_score = result.evaluation_function()
+    @staticmethod
+    def _create_search(board):
+        from engine.ordering import HeuristicOrdering
+        from engine.search import AlphaBetaSearch
+        from engine.transposition import TranspositionTable
 
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_board = next_board_state
+        if Minimax.table is None:
+            Minimax.table = TranspositionTable()
+        if Minimax.ordering is None:
+            Minimax.ordering = HeuristicOrdering()
+        return AlphaBetaSearch(board, Minimax.table, Minimax.ordering, **Minimax.search_options())
 
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
+    @staticmethod
+    def search_options():
+        # argumentele AlphaBetaSearch comune cautarii seriale si proceselor din cautarile paralele
+        from engine.search import AlphaBetaSearch
+
+        return {
+            'pvs': Minimax.pvs,
+            'aspiration': AlphaBetaSearch.ASPIRATION_WINDOW if Minimax.aspiration else None,
+            'null_move': Minimax.null_move,
+            'lmr': Minimax.lmr,
+            'quiescence': Minimax.quiescence,
+        }
 
-            return best_board if best_board else current_board
+    @staticmethod
+    def start_pondering(board, result=None, player=PlayerType.Human):
+        # board e pozitia de dupa mutarea calculatorului, cu `player` la mutare;
+        # raspunsul prezis e a doua mutare din varianta principala a rezultatului
+        from engine.ponder import Ponderer
 
-        else:
-            min_eval = float('inf')
-            possible_boards = current_board.get_all_possible_next_boards(PlayerType.Human)
+        if Minimax.ponderer is None:
+            Minimax.ponderer = Ponderer(Minimax._create_search)
+        predicted = result.pv[1] if result is not None and len(result.pv) > 1 else None
+        Minimax.ponderer.start(board, player, predicted)
 
-            if not possible_boards:
-                return current_board
+    @staticmethod
+    def stop_pondering(board=None, player=PlayerType.Computer):
+        # intoarce True daca adversarul a jucat mutarea prezisa
+        if Minimax.ponderer is None:
+            return False
+        return Minimax.ponderer.stop(board, player)
 
-            for next_board_state in possible_boards:
-                result = Minimax.find_next_board(
-                    next_board_state, depth - 1, alpha, beta, True
-                )
-                eval_score = result.evaluation_function()
+    @staticmethod
+    def find_next_board(current_board, depth=3, alpha=float('-inf'), beta=float('inf'), maximizing=True,
+                        time_budget=None):
+        result = Minimax.find_best_result(current_board, depth, maximizing, time_budget, alpha, beta)
+        if result.action is None:
+            return current_board
+        return current_board.apply_action(result.action, result.player)
 
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_board = next_board_state
+    @staticmethod
+    def _ensure_parallel(workers, parallel_mode):
+        from engine.parallel import ParallelRootSearch
+        from engine.smp import LazySMPSearch
+
+        if parallel_mode == 'smp':
+            if not isinstance(Minimax.parallel, LazySMPSearch) or Minimax.parallel.helpers != workers - 1:
+                Minimax.shutdown()
+                Minimax.parallel = LazySMPSearch(workers - 1)
+        elif not isinstance(Minimax.parallel, ParallelRootSearch) or Minimax.parallel.workers != workers:
+            Minimax.shutdown()
+            Minimax.parallel = ParallelRootSearch(workers)
 
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
+    @staticmethod
+    def reset():
+        # uita tot ce s-a invatat din cautarile anterioare
+        Minimax.stop_pondering()
+        Minimax.table = None
+        Minimax.ordering = None
 
-            return best_board if best_board else current_board
\ No newline at end of file
+    @staticmethod
+    def shutdown():
+        Minimax.stop_pondering()
+        if Minimax.parallel is not None:
+            Minimax.parallel.close()
+            Minimax.parallel = None
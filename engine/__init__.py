@@ -0,0 +1,23 @@
+from .search import AlphaBetaSearch, SearchResult, SearchTimeout
+from .ordering import BasicOrdering, HeuristicOrdering
+from .transposition import TranspositionTable, SharedTranspositionTable, Bound
+from .parallel import ParallelRootSearch
+from .smp import LazySMPSearch
+from .ponder import Ponderer
+from .process import EngineProcess, EngineError
+
+__all__ = [
+    'AlphaBetaSearch',
+    'SearchResult',
+    'SearchTimeout',
+    'TranspositionTable',
+    'SharedTranspositionTable',
+    'Bound',
+    'BasicOrdering',
+    'HeuristicOrdering',
+    'ParallelRootSearch',
+    'LazySMPSearch',
+    'Ponderer',
+    'EngineProcess',
+    'EngineError'
+]
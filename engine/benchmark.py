@@ -0,0 +1,368 @@
+import argparse
+import time
+
+from GameClasses import Board, PlayerType, PieceType, ActionKind, encode_action
+from .ordering import BasicOrdering, HeuristicOrdering
+from .parallel import ParallelRootSearch
+from .search import AlphaBetaSearch
+from .smp import LazySMPSearch
+from .transposition import TranspositionTable
+
+
+def place(x, y, piece_type=PieceType.Flat):
+    return encode_action(ActionKind.Place, x * 4 + y, piece_type)
+
+
+def move(x, y, new_x, new_y):
+    return encode_action(ActionKind.Move, x * 4 + y, new_x * 4 + new_y)
+
+
+# pozitii de referinta, jucatorii alterneaza incepand cu calculatorul
+POSITIONS = {
+    'opening': [],
+    'early': [
+        place(1, 1), place(2, 2), place(1, 2), place(2, 1),
+    ],
+    'midgame': [
+        place(1, 1), place(2, 2), place(1, 2), place(2, 1),
+        place(0, 1), place(3, 2), place(0, 2, PieceType.Standing), place(1, 3),
+    ],
+    'stacked': [
+        place(1, 1), place(2, 2), place(1, 2), place(2, 1),
+        move(1, 1, 2, 1), move(2, 2, 1, 2), place(0, 0), place(3, 3),
+        move(2, 1, 2, 2), place(1, 1),
+    ],
+    'nearfull': [
+        place(0, 2), place(1, 3, PieceType.Standing), place(3, 1), place(3, 3, PieceType.Standing),
+        place(3, 2), place(3, 0), place(2, 3), place(2, 2), place(1, 0), place(0, 1),
+        place(0, 3), place(1, 1), place(2, 0),
+    ],
+}
+
+
+def build_position(actions):
+    board = Board()
+    player = PlayerType.Computer
+    for action in actions:
+        if action not in board.legal_actions(player):
+            raise ValueError(f"actiune ilegala in pozitia de referinta: {action}")
+        board.do_action(action, player)
+        player = AlphaBetaSearch.opponent(player)
+    return board, player
+
+
+class CopyingSearch:
+    # cautarea alfa-beta cu o tabla noua pe fiecare nod, pentru comparatie
+
+    def __init__(self, board):
+        self.board = board
+        self.nodes = 0
+
+    def search(self, depth, player):
+        return self._alphabeta(self.board, depth, float('-inf'), float('inf'), player)
+
+    def _alphabeta(self, board, depth, alpha, beta, player):
+        self.nodes += 1
+        finished, winner = board.check_finish()
+        if finished or depth == 0:
+            return board.evaluation_function()
+
+        children = board.get_all_possible_next_boards(player)
+        if not children:
+            return board.evaluation_function()
+
+        opponent = AlphaBetaSearch.opponent(player)
+        maximizing = player == PlayerType.Computer
+        best = float('-inf') if maximizing else float('inf')
+        for child in children:
+            score = self._alphabeta(child, depth - 1, alpha, beta, opponent)
+            if maximizing:
+                best = max(best, score)
+                alpha = max(alpha, score)
+            else:
+                best = min(best, score)
+                beta = min(beta, score)
+            if beta <= alpha:
+                break
+        return best
+
+
+def run(search, depth, player):
+    start = time.perf_counter()
+    result = search.search(depth, player)
+    elapsed = time.perf_counter() - start
+    score = result[0] if isinstance(result, tuple) else result
+    return score, search.nodes, elapsed
+
+
+def compare_copying(depths):
+    print(f"{'pozitie':<10} {'d':>2} {'noduri':>9} {'copiere s':>10} {'in-place s':>11} {'noduri/s':>10} {'x':>6}")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            copy_score, copy_nodes, copy_time = run(CopyingSearch(Board(board)), depth, player)
+            score, nodes, elapsed = run(AlphaBetaSearch(board, ordering=BasicOrdering()), depth, player)
+            if (score, nodes) != (copy_score, copy_nodes):
+                raise AssertionError(f"{name} d={depth}: arbori diferiti ({nodes} vs {copy_nodes})")
+            print(f"{name:<10} {depth:>2} {nodes:>9} {copy_time:>10.3f} {elapsed:>11.3f} "
+                  f"{nodes / elapsed:>10.0f} {copy_time / elapsed:>6.2f}")
+
+
+def compare_transpositions(depths):
+    print(f"{'pozitie':<10} {'d':>2} {'fara TT':>9} {'cu TT':>9} {'reducere':>9} {'hit rate':>9} {'fara s':>8} {'cu s':>8}")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            plain_score, plain_nodes, plain_time = run(AlphaBetaSearch(board), depth, player)
+            table = TranspositionTable()
+            score, nodes, elapsed = run(AlphaBetaSearch(board, table), depth, player)
+            if score != plain_score:
+                raise AssertionError(f"{name} d={depth}: scor diferit cu TT ({score} vs {plain_score})")
+            print(f"{name:<10} {depth:>2} {plain_nodes:>9} {nodes:>9} {1 - nodes / plain_nodes:>9.1%} "
+                  f"{table.hit_rate():>9.1%} {plain_time:>8.2f} {elapsed:>8.2f}")
+
+
+def compare_ordering(depths):
+    print(f"{'pozitie':<10} {'d':>2} {'noduri':>9} {'prima %':>8} {'s':>7}   "
+          f"{'noduri':>9} {'prima %':>8} {'s':>7} {'reducere':>9}")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            line = f"{name:<10} {depth:>2}"
+            results = []
+            for ordering in (BasicOrdering(), HeuristicOrdering()):
+                search = AlphaBetaSearch(board, TranspositionTable(), ordering)
+                start = time.perf_counter()
+                score, action = search.iterative_deepening(player, depth)
+                elapsed = time.perf_counter() - start
+                results.append((score, search.nodes))
+                line += f" {search.nodes:>9} {search.first_move_cutoff_rate():>8.1%} {elapsed:>7.2f}  "
+            (basic_score, basic_nodes), (score, nodes) = results
+            if score != basic_score:
+                raise AssertionError(f"{name} d={depth}: scor diferit cu ordonare ({score} vs {basic_score})")
+            print(line + f" {1 - nodes / basic_nodes:>9.1%}")
+
+
+def compare_pvs(depths):
+    window = AlphaBetaSearch.ASPIRATION_WINDOW
+    variants = [
+        ('clasic', {}),
+        ('pvs', {'pvs': True}),
+        ('aspiratie', {'aspiration': window}),
+        ('pvs+asp', {'pvs': True, 'aspiration': window}),
+    ]
+    print(f"{'pozitie':<10} {'d':>2} {'varianta':<10} {'noduri':>9} {'reducere':>9} {'re-cautari':>11} "
+          f"{'s':>7} {'scor':>7}  mutare")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            classic = None
+            for label, options in variants:
+                search = AlphaBetaSearch(board, TranspositionTable(), **options)
+                start = time.perf_counter()
+                score, action = search.iterative_deepening(player, depth)
+                elapsed = time.perf_counter() - start
+                if classic is None:
+                    classic = (score, search.nodes)
+                elif score != classic[0]:
+                    raise AssertionError(f"{name} d={depth} {label}: scor {score} vs {classic[0]}")
+                print(f"{name:<10} {depth:>2} {label:<10} {search.nodes:>9} {1 - search.nodes / classic[1]:>9.1%} "
+                      f"{search.researches:>11} {elapsed:>7.2f} {score:>7}  {action}")
+
+
+SELECTIVE_VARIANTS = [
+    ('complet', {}),
+    ('null', {'null_move': True}),
+    ('lmr', {'lmr': True}),
+    ('null+lmr', {'null_move': True, 'lmr': True}),
+]
+
+
+def compare_selective(depths):
+    print(f"{'pozitie':<10} {'d':>2} {'varianta':<10} {'noduri':>9} {'reducere':>9} {'taieri nule':>12} "
+          f"{'reduse':>7} {'s':>7} {'noduri/s':>9} {'scor':>7}  mutare")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            full_nodes = None
+            for label, options in SELECTIVE_VARIANTS:
+                search = AlphaBetaSearch(board, TranspositionTable(), pvs=True, **options)
+                start = time.perf_counter()
+                score, action = search.iterative_deepening(player, depth)
+                elapsed = time.perf_counter() - start
+                if full_nodes is None:
+                    full_nodes = search.nodes
+                print(f"{name:<10} {depth:>2} {label:<10} {search.nodes:>9} {1 - search.nodes / full_nodes:>9.1%} "
+                      f"{search.null_cutoffs:>12} {search.reductions:>7} {elapsed:>7.2f} "
+                      f"{search.nodes / elapsed:>9.0f} {score:>7}  {action}")
+
+
+def play_game(board, player, engines, depth, max_plies=60):
+    # engines: jucator -> (optiuni, tabela); intoarce castigatorul sau None la remiza
+    board = Board(board)
+    nodes = {engine_player: 0 for engine_player in engines}
+    for _ in range(max_plies):
+        finished, winner = board.check_finish()
+        if finished:
+            return winner, nodes
+        options, table = engines[player]
+        search = AlphaBetaSearch(board, table, pvs=True, **options)
+        score, action = search.iterative_deepening(player, depth)
+        nodes[player] += search.nodes
+        if action is None:
+            return None, nodes
+        board.do_action(action, player)
+        player = AlphaBetaSearch.opponent(player)
+    finished, winner = board.check_finish()
+    return (winner if finished else None), nodes
+
+
+def play_match(options, baseline_options, depth):
+    wins = draws = losses = 0
+    variant_nodes = baseline_nodes = 0
+    for actions in POSITIONS.values():
+        board, player = build_position(actions)
+        for variant_player in (PlayerType.Computer, PlayerType.Human):
+            baseline_player = AlphaBetaSearch.opponent(variant_player)
+            engines = {variant_player: (options, TranspositionTable()),
+                       baseline_player: (baseline_options, TranspositionTable())}
+            winner, nodes = play_game(board, player, engines, depth)
+            variant_nodes += nodes[variant_player]
+            baseline_nodes += nodes[baseline_player]
+            if winner == variant_player:
+                wins += 1
+            elif winner == baseline_player:
+                losses += 1
+            else:
+                draws += 1
+    return wins, draws, losses, variant_nodes, baseline_nodes
+
+
+def print_match(label, depth, match):
+    wins, draws, losses, variant_nodes, baseline_nodes = match
+    print(f"{label:<10} {depth:>2} {wins:>7} {draws:>7} {losses:>8} {variant_nodes:>9} {baseline_nodes:>11}")
+
+
+def self_play(depths):
+    baseline = SELECTIVE_VARIANTS[0]
+    print(f"{'varianta':<10} {'d':>2} {'castig':>7} {'remiza':>7} {'pierdut':>8} {'noduri':>9} {'noduri ref':>11}")
+    for label, options in SELECTIVE_VARIANTS[1:]:
+        for depth in depths:
+            print_match(label, depth, play_match(options, baseline[1], depth))
+
+
+def compare_quiescence(depths):
+    print(f"{'pozitie':<10} {'d':>2} {'noduri':>9} {'s':>7} {'noduri/s':>9}   "
+          f"{'noduri':>9} {'q noduri':>9} {'s':>7} {'noduri/s':>9}")
+    for name, actions in POSITIONS.items():
+        board, player = build_position(actions)
+        for depth in depths:
+            line = f"{name:<10} {depth:>2}"
+            for options in ({}, {'quiescence': True}):
+                search = AlphaBetaSearch(board, TranspositionTable(), pvs=True, **options)
+                start = time.perf_counter()
+                search.iterative_deepening(player, depth)
+                elapsed = time.perf_counter() - start
+                if options:
+                    line += f" {search.nodes:>9} {search.quiescence_nodes:>9}"
+                else:
+                    line += f" {search.nodes:>9}"
+                line += f" {elapsed:>7.2f} {search.nodes / elapsed:>9.0f}  "
+            print(line)
+
+    print()
+    print(f"{'varianta':<10} {'d':>2} {'castig':>7} {'remiza':>7} {'pierdut':>8} {'noduri':>9} {'noduri ref':>11}")
+    for depth in (1, 2, 3):
+        print_match('quiesc', depth, play_match({'quiescence': True}, {}, depth))
+
+
+def compare_parallel(depths, worker_counts=(1, 2, 4, 8)):
+    print(f"{'pozitie':<10} {'d':>2} {'serial s':>9} " + " ".join(f"{f'{w}w s':>8} {'x':>5}" for w in worker_counts))
+    searches = {workers: ParallelRootSearch(workers) for workers in worker_counts}
+    try:
+        for search in searches.values():
+            # pornim procesele inainte de masurare
+            search.iterative_deepening(Board(), PlayerType.Computer, 1)
+        for name, actions in POSITIONS.items():
+            board, player = build_position(actions)
+            for depth in depths:
+                serial = AlphaBetaSearch(board, TranspositionTable())
+                start = time.perf_counter()
+                serial_score, serial_action = serial.iterative_deepening(player, depth)
+                serial_time = time.perf_counter() - start
+                line = f"{name:<10} {depth:>2} {serial_time:>9.2f}"
+                for workers, search in searches.items():
+                    start = time.perf_counter()
+                    result = search.iterative_deepening(board, player, depth)
+                    elapsed = time.perf_counter() - start
+                    if result.score != serial_score:
+                        raise AssertionError(f"{name} d={depth} {workers}w: scor {result.score} vs {serial_score}")
+                    line += f" {elapsed:>8.2f} {serial_time / elapsed:>5.2f}"
+                print(line)
+    finally:
+        for search in searches.values():
+            search.close()
+
+
+def compare_lazy_smp(depths, helper_counts=(1, 3)):
+    max_depth = max(depths)
+    header = f"{'pozitie':<10} {'d':>2} {'serial s':>9}"
+    for helpers in helper_counts:
+        header += f" {f'smp{helpers + 1} s':>9} {'x':>5}"
+    print(header)
+
+    searches = {helpers: LazySMPSearch(helpers) for helpers in helper_counts}
+    try:
+        for search in searches.values():
+            search.iterative_deepening(Board(), PlayerType.Computer, 1)
+        for name, actions in POSITIONS.items():
+            board, player = build_position(actions)
+            serial = AlphaBetaSearch(board, TranspositionTable())
+            serial_score, serial_action = serial.iterative_deepening(player, max_depth)
+            serial_times = {depth: elapsed for depth, score, action, nodes, elapsed in serial.iterations}
+
+            smp_times = {}
+            for helpers, search in searches.items():
+                search.table.clear()
+                search.iterative_deepening(board, player, max_depth)
+                smp_times[helpers] = {depth: elapsed for depth, score, action, nodes, elapsed in search.iterations}
+
+            for depth in depths:
+                if depth not in serial_times:
+                    continue
+                line = f"{name:<10} {depth:>2} {serial_times[depth]:>9.3f}"
+                for helpers in helper_counts:
+                    elapsed = smp_times[helpers].get(depth)
+                    if elapsed is None:
+                        line += f" {'-':>9} {'-':>5}"
+                    else:
+                        line += f" {elapsed:>9.3f} {serial_times[depth] / elapsed:>5.2f}"
+                print(line)
+    finally:
+        for search in searches.values():
+            search.close()
+
+
+MODES = {
+    'copy': compare_copying,
+    'tt': compare_transpositions,
+    'ordering': compare_ordering,
+    'pvs': compare_pvs,
+    'selective': compare_selective,
+    'selfplay': self_play,
+    'quiescence': compare_quiescence,
+    'parallel': compare_parallel,
+    'smp': compare_lazy_smp,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Masuratori pentru motorul de cautare")
+    parser.add_argument('mode', choices=sorted(MODES))
+    parser.add_argument('depths', nargs='*', type=int, default=[2, 3, 4])
+    args = parser.parse_args()
+    MODES[args.mode](args.depths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import re
+
+from GameClasses import ActionKind, Board, PieceType, PlayerType, decode_action, encode_action
+
+# notatie text pentru protocolul motorului, in stilul PTN/TPS:
+#   celula: litera coloanei (y) + numarul randului (x + 1), de ex. b3
+#   plasare: b3 (plata) sau Sb3 (perete); mutare: b3+ b3- b3> b3< (rand +1/-1, coloana +1/-1)
+#   pozitie: randurile de sus in jos separate de '/', celulele de ',', 'x' sau 'xN' pentru celule goale,
+#            stiva ca cifre de proprietar de jos in sus (1 calculator, 2 om), 'S' dupa un perete;
+#            urmeaza jucatorul la mutare, de ex. "x4/x,1,2S,x/x2,12,x/x4 2"
+
+DIRECTIONS = {'+': (1, 0), '-': (-1, 0), '>': (0, 1), '<': (0, -1)}
+PLAYERS = {'1': PlayerType.Computer, '2': PlayerType.Human}
+# un perete poate fi doar in varful stivei
+STACK = re.compile(r'[12]+S?')
+
+
+def format_cell(cell, size):
+    x, y = divmod(cell, size)
+    return f"{chr(ord('a') + y)}{x + 1}"
+
+
+def parse_cell(text, size):
+    if len(text) < 2 or not text[1:].isdigit():
+        raise ValueError(f"celula invalida: {text}")
+    x, y = int(text[1:]) - 1, ord(text[0]) - ord('a')
+    if not (0 <= x < size and 0 <= y < size):
+        raise ValueError(f"celula in afara tablei: {text}")
+    return x * size + y
+
+
+def format_action(action, size):
+    kind, source, argument = decode_action(action)
+    if kind == ActionKind.Place:
+        prefix = "S" if argument == PieceType.Standing else ""
+        return prefix + format_cell(source, size)
+    dx, dy = divmod(argument, size)
+    sx, sy = divmod(source, size)
+    for symbol, delta in DIRECTIONS.items():
+        if delta == (dx - sx, dy - sy):
+            return format_cell(source, size) + symbol
+    raise ValueError(f"mutare pe o celula care nu e vecina: {action}")
+
+
+def parse_action(text, size):
+    if text and text[-1] in DIRECTIONS:
+        source = parse_cell(text[:-1], size)
+        dx, dy = DIRECTIONS[text[-1]]
+        x, y = divmod(source, size)
+        x, y = x + dx, y + dy
+        if not (0 <= x < size and 0 <= y < size):
+            raise ValueError(f"mutare in afara tablei: {text}")
+        return encode_action(ActionKind.Move, source, x * size + y)
+    if text[:1] in ('S', 'F'):
+        piece_type = PieceType.Standing if text[0] == 'S' else PieceType.Flat
+        return encode_action(ActionKind.Place, parse_cell(text[1:], size), piece_type)
+    return encode_action(ActionKind.Place, parse_cell(text, size), PieceType.Flat)
+
+
+def format_position(board, player):
+    rows = []
+    for x in reversed(range(board.size)):
+        cells = []
+        empty = 0
+        for y in range(board.size):
+            stack = board.stacks[x * board.size + y]
+            if not stack:
+                empty += 1
+                continue
+            if empty:
+                cells.append("x" if empty == 1 else f"x{empty}")
+                empty = 0
+            cells.append("".join(f"{board.piece_owner[piece_id]}{'S' if board.piece_type[piece_id] == PieceType.Standing else ''}"
+                                 for piece_id in stack))
+        if empty:
+            cells.append("x" if empty == 1 else f"x{empty}")
+        rows.append(",".join(cells))
+    return f"{'/'.join(rows)} {player}"
+
+
+def parse_position(text):
+    fields = text.split()
+    if len(fields) != 2 or fields[1] not in PLAYERS:
+        raise ValueError(f"pozitie invalida: {text}")
+    rows = fields[0].split('/')
+    size = len(rows)
+    start = Board()
+    # actiunile codifica celula pe 6 biti si rezervele sunt cele de 4x4, deci doar tabla standard
+    if size != start.size:
+        raise ValueError(f"tabla de {size}x{size} nu e suportata, doar {start.size}x{start.size}")
+
+    # rezervele se deduc din piesele aflate pe tabla
+    available = {player: dict(reserve) for player, reserve in start.available_pieces.items()}
+    stacks = [[] for _ in range(size * size)]
+    for row_index, row in enumerate(rows):
+        x = size - 1 - row_index
+        y = 0
+        for item in row.split(','):
+            if item.startswith('x'):
+                y += int(item[1:] or 1)
+                continue
+            if y >= size:
+                raise ValueError(f"rand prea lung: {row}")
+            if not STACK.fullmatch(item):
+                raise ValueError(f"stiva invalida: {item}")
+            owners = item.rstrip('S')
+            pieces = []
+            for index, char in enumerate(owners):
+                standing = index == len(owners) - 1 and item.endswith('S')
+                piece_type = PieceType.Standing if standing else PieceType.Flat
+                owner = PLAYERS[char]
+                pieces.append((owner, piece_type))
+                available[owner][piece_type] -= 1
+            stacks[x * size + y] = pieces
+            y += 1
+        if y != size:
+            raise ValueError(f"rand cu {y} celule in loc de {size}: {row}")
+
+    if any(count < 0 for reserve in available.values() for count in reserve.values()):
+        raise ValueError(f"prea multe piese in pozitie: {text}")
+    return Board.from_stacks(size, stacks, available), PLAYERS[fields[1]]
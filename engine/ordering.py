@@ -0,0 +1,81 @@
+from GameClasses import PlayerType, action_target
+
+
+class BasicOrdering:
+    # doar mutarea din tabela de transpozitie e incercata prima
+
+    def __init__(self):
+        # indicele primei mutari linistite din ultima lista ordonata
+        self.first_quiet = 0
+
+    def new_search(self):
+        pass
+
+    def order(self, board, actions, player, ply, tt_move):
+        self.first_quiet = 0
+        if tt_move is not None and tt_move in actions:
+            actions.remove(tt_move)
+            actions.insert(0, tt_move)
+            self.first_quiet = 1
+        return actions
+
+    def record_cutoff(self, action, player, ply, depth):
+        pass
+
+
+class HeuristicOrdering(BasicOrdering):
+    TT_MOVE = 1 << 30
+    ROAD_WIN = 1 << 29
+    ROAD_BLOCK = 1 << 28
+    KILLER = 1 << 27
+    MAX_PLY = 64
+
+    def __init__(self):
+        super().__init__()
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.history = {PlayerType.Computer: {}, PlayerType.Human: {}}
+
+    def new_search(self):
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        # istoricul vechi conteaza mai putin in cautarea noua
+        for history in self.history.values():
+            for action in history:
+                history[action] >>= 1
+
+    def order(self, board, actions, player, ply, tt_move):
+        opponent = PlayerType.Human if player == PlayerType.Computer else PlayerType.Computer
+        wins = board.winning_actions(player)
+        threats = board.threatened_cells(opponent)
+        killers = self.killers[ply] if ply < self.MAX_PLY else (None, None)
+        history = self.history[player]
+
+        def priority(action):
+            if action == tt_move:
+                return self.TT_MOVE
+            if action in wins:
+                return self.ROAD_WIN
+            if threats >> action_target(action) & 1:
+                return self.ROAD_BLOCK
+            if action == killers[0]:
+                return self.KILLER + 1
+            if action == killers[1]:
+                return self.KILLER
+            return history.get(action, 0)
+
+        priorities = {action: priority(action) for action in actions}
+        actions.sort(key=priorities.__getitem__, reverse=True)
+        self.first_quiet = 0
+        for action in actions:
+            if priorities[action] < self.KILLER:
+                break
+            self.first_quiet += 1
+        return actions
+
+    def record_cutoff(self, action, player, ply, depth):
+        if ply < self.MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != action:
+                killers[1] = killers[0]
+                killers[0] = action
+        history = self.history[player]
+        history[action] = history.get(action, 0) + depth * depth
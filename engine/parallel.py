@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from GameClasses import PlayerType
+from .search import AlphaBetaSearch, SearchResult, SearchTimeout, WIN_SCORE
+from .transposition import TranspositionTable
+
+_shared_bound = None
+_worker_table = None
+_worker_generation = None
+_worker_stop = None
+
+
+def _init_worker(shared_bound, stop):
+    global _shared_bound, _worker_table, _worker_stop
+    _shared_bound = shared_bound
+    _worker_table = TranspositionTable()
+    _worker_stop = stop
+
+
+def _search_root_action(board, action, depth, player, time_budget, generation, options):
+    global _worker_generation
+    maximizing = player == PlayerType.Computer
+    # limita cea mai buna de la radacina, publicata de ceilalti workeri
+    bound = _shared_bound.value
+    alpha, beta = (bound, float('inf')) if maximizing else (float('-inf'), bound)
+
+    if generation != _worker_generation:
+        _worker_table.new_search()
+        _worker_generation = generation
+    search = AlphaBetaSearch(board, _worker_table, **options)
+    search.stop = _worker_stop
+    try:
+        score = search.search_action(action, depth, player, alpha, beta, time_budget)
+    except SearchTimeout:
+        return action, None, search.nodes, []
+
+    with _shared_bound.get_lock():
+        if (maximizing and score > _shared_bound.value) or (not maximizing and score < _shared_bound.value):
+            _shared_bound.value = score
+
+    search.completed_depth = depth
+    return action, score, search.nodes, search.principal_variation(action, player)
+
+
+class ParallelRootSearch:
+
+    # cat de des se verifica oprirea ceruta de apelant cat timp se asteapta workerii
+    STOP_POLL = 0.005
+
+    def __init__(self, workers=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # cea mai buna actiune de la radacina primita in cautarea curenta, si daca aceasta e oprita
+        self.best_action = None
+        # argumentele AlphaBetaSearch pentru workeri, vezi Minimax.search_options
+        self.options = {}
+        # spawn, nu fork: procesul GUI are deja fire de executie Qt pornite
+        self._context = multiprocessing.get_context('spawn')
+        self._bound = self._context.Value('d', 0.0)
+        self._stop = self._context.Event()
+        self._executor = None
+        self._generation = 0
+        self.nodes = 0
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=self._context,
+                initializer=_init_worker, initargs=(self._bound, self._stop)
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._stop.set()
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def search(self, board, depth, player, time_budget=None, ordered_actions=None, stop=None):
+        maximizing = player == PlayerType.Computer
+        actions = ordered_actions or board.legal_actions(player)
+        if depth <= 0 or not actions or board.check_finish()[0]:
+            return board.evaluation_function(), None, [], {}
+
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        self._bound.value = float('-inf') if maximizing else float('inf')
+        self._generation += 1
+        self._stop.clear()
+        self.best_action = None
+        pool = self._pool()
+
+        def submit(action):
+            remaining = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+            return pool.submit(_search_root_action, board, action, depth, player, remaining, self._generation,
+                               self.options)
+
+        # prima mutare se cauta singura, ca ceilalti sa porneasca cu o limita buna
+        pending = {submit(actions[0])}
+        rest = list(actions[1:])
+        scores = {}
+        best_score, best_action, best_pv = None, None, []
+
+        while pending:
+            timeout = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+            if stop is not None:
+                timeout = self.STOP_POLL if timeout is None else min(timeout, self.STOP_POLL)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if stop is not None and stop.is_set():
+                # workerii isi abandoneaza radacinile la urmatoarea verificare
+                self._stop.set()
+                for future in pending:
+                    future.cancel()
+                raise SearchTimeout()
+            if not done:
+                if deadline is None or time.perf_counter() < deadline:
+                    continue
+                for future in pending:
+                    future.cancel()
+                raise SearchTimeout()
+
+            for future in done:
+                action, score, nodes, pv = future.result()
+                self.nodes += nodes
+                if score is None:
+                    for other in pending:
+                        other.cancel()
+                    raise SearchTimeout()
+                scores[action] = score
+                if (best_action is None or (maximizing and score > best_score)
+                        or (not maximizing and score < best_score)):
+                    best_score, best_action, best_pv = score, action, pv
+                    self.best_action = action
+
+            if abs(best_score) >= WIN_SCORE and (best_score > 0) == maximizing:
+                for other in pending:
+                    other.cancel()
+                break
+            while rest and len(pending) < self.workers:
+                pending.add(submit(rest.pop(0)))
+
+        return best_score, best_action, best_pv, scores
+
+    def iterative_deepening(self, board, player, max_depth, time_budget=None, stop=None, on_iteration=None):
+        start = time.perf_counter()
+        self.nodes = 0
+        maximizing = player == PlayerType.Computer
+        actions = board.legal_actions(player)
+        result = SearchResult(None, board.evaluation_function(), [], 0, 0, player)
+        iterations = []
+
+        for depth in range(1, max(max_depth, 0) + 1):
+            remaining = None
+            if time_budget is not None and depth > 1:
+                remaining = time_budget - (time.perf_counter() - start)
+                if remaining <= 0:
+                    break
+            try:
+                score, action, pv, scores = self.search(board, depth, player, remaining, actions, stop)
+            except SearchTimeout:
+                if result.action is None and actions:
+                    # oprita inainte de prima iteratie completa: cea mai buna radacina primita, altfel prima
+                    fallback = self.best_action if self.best_action is not None else actions[0]
+                    result = SearchResult(fallback, result.score, [fallback], 0, self.nodes, player)
+                break
+
+            result = SearchResult(action, score, pv, depth, self.nodes, player)
+            iterations.append((depth, score, self.nodes, time.perf_counter() - start))
+            if on_iteration is not None:
+                result.stats = self._statistics(depth, start, iterations)
+                on_iteration(result)
+            if action is None or abs(score) >= WIN_SCORE:
+                break
+            # iteratia urmatoare incepe cu mutarile cele mai bune de acum
+            actions.sort(key=lambda a: scores.get(a, float('-inf') if maximizing else float('inf')),
+                         reverse=maximizing)
+            if time_budget is not None and (time.perf_counter() - start) * 2 > time_budget:
+                break
+
+        result.nodes = self.nodes
+        result.stats = self._statistics(result.depth, start, iterations)
+        return result
+
+    def _statistics(self, depth, start, iterations):
+        elapsed = time.perf_counter() - start
+        # procesele intorc doar numarul de noduri, restul contoarelor lipsesc
+        return {
+            'nodes': self.nodes,
+            'depth': depth,
+            'elapsed': elapsed,
+            'nps': self.nodes / elapsed if elapsed else 0.0,
+            'iterations': list(iterations),
+        }
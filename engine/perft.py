@@ -0,0 +1,83 @@
+import argparse
+import time
+
+from .benchmark import POSITIONS, build_position
+from .search import AlphaBetaSearch
+
+
+# numarul de frunze pe adancime pentru pozitiile de referinta; pozitiile terminate nu au urmasi
+PERFT_COUNTS = {
+    'opening': [32, 960, 28272, 777584],
+    'early': [32, 972, 28762, 805072],
+    'midgame': [25, 714, 15242, 404838],
+    'stacked': [28, 843, 21924, 606600],
+    'nearfull': [16, 347, 5232, 110916],
+}
+
+
+def perft(board, player, depth):
+    if board.check_finish()[0]:
+        return 0
+    if depth == 1:
+        return len(board.legal_actions(player))
+
+    opponent = AlphaBetaSearch.opponent(player)
+    leaves = 0
+    for action in board.legal_actions(player):
+        undo = board.do_action(action, player)
+        leaves += perft(board, opponent, depth - 1)
+        board.undo_action(undo)
+    return leaves
+
+
+def divide(board, player, depth):
+    opponent = AlphaBetaSearch.opponent(player)
+    counts = {}
+    for action in board.legal_actions(player):
+        undo = board.do_action(action, player)
+        counts[action] = perft(board, opponent, depth - 1) if depth > 1 else 1
+        board.undo_action(undo)
+    return counts
+
+
+def run(max_depth, positions=None, check=True):
+    failures = 0
+    print(f"{'pozitie':<10} {'d':>2} {'frunze':>10} {'asteptat':>10} {'s':>8} {'noduri/s':>10}")
+    for name in positions or POSITIONS:
+        board, player = build_position(POSITIONS[name])
+        expected = PERFT_COUNTS.get(name, [])
+        for depth in range(1, max_depth + 1):
+            start = time.perf_counter()
+            leaves = perft(board, player, depth)
+            elapsed = time.perf_counter() - start
+            known = expected[depth - 1] if depth <= len(expected) else None
+            status = '' if known is None else ('ok' if known == leaves else 'GRESIT')
+            if check and known is not None and known != leaves:
+                failures += 1
+            print(f"{name:<10} {depth:>2} {leaves:>10} {known if known is not None else '-':>10} "
+                  f"{elapsed:>8.3f} {leaves / elapsed if elapsed else 0:>10.0f} {status}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Numara pozitiile frunza ale generatorului de mutari")
+    parser.add_argument('depth', nargs='?', type=int, default=3)
+    parser.add_argument('--position', action='append', choices=sorted(POSITIONS))
+    parser.add_argument('--divide', action='store_true', help="frunzele pentru fiecare actiune de la radacina")
+    args = parser.parse_args()
+
+    if args.divide:
+        for name in args.position or POSITIONS:
+            board, player = build_position(POSITIONS[name])
+            counts = divide(board, player, args.depth)
+            for action, leaves in sorted(counts.items()):
+                print(f"{name:<10} {action:>6} {leaves:>10}")
+            print(f"{name:<10} {'total':>6} {sum(counts.values()):>10}")
+        return
+
+    if run(args.depth, args.position):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import threading
+
+from GameClasses import PlayerType
+from .search import AlphaBetaSearch
+
+
+class Ponderer:
+    # cauta pe un fir separat cat timp adversarul se gandeste; tabela si ordonarea sunt
+    # ale cautarii reale, asa ca raman calde pentru mutarea urmatoare
+
+    MAX_DEPTH = 32
+
+    def __init__(self, create_search):
+        # create_search(board) -> AlphaBetaSearch care foloseste tabela si ordonarea comune
+        self.create_search = create_search
+        self.search = None
+        self.expected_key = None
+        self.hits = 0
+        self.misses = 0
+        self._thread = None
+        self._stop = threading.Event()
+        # start/stop pot veni din bucla motorului si din firul de cautare in acelasi timp
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._thread is not None
+
+    def start(self, board, player, predicted=None):
+        # board are `player` la mutare; predicted e raspunsul asteptat de la el (PV[1])
+        with self._lock:
+            self._stop_locked()
+            self._start_locked(board, player, predicted)
+
+    def _start_locked(self, board, player, predicted):
+        if predicted is not None and board.is_legal(predicted, player):
+            # gandim deja la raspunsul nostru pentru mutarea prezisa
+            position = board.apply_action(predicted, player)
+            player = AlphaBetaSearch.opponent(player)
+            self.expected_key = position.zobrist_key(player)
+        else:
+            # fara predictie: cautam pozitia adversarului, pentru tabela si ordonare
+            position = board
+            self.expected_key = None
+        if position.check_finish()[0]:
+            return
+
+        self._stop = threading.Event()
+        self.search = self.create_search(position)
+        self.search.stop = self._stop
+        self._thread = threading.Thread(target=self._run, args=(self.search, player), daemon=True)
+        self._thread.start()
+
+    def _run(self, search, player):
+        search.iterative_deepening(player, self.MAX_DEPTH)
+
+    def stop(self, board=None, player=PlayerType.Computer):
+        # opreste gandirea; intoarce True daca pozitia reala e cea prezisa
+        with self._lock:
+            return self._stop_locked(board, player)
+
+    def _stop_locked(self, board=None, player=PlayerType.Computer):
+        if self._thread is None:
+            return False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        hit = False
+        if self.expected_key is not None and board is not None:
+            hit = board.zobrist_key(player) == self.expected_key
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self.expected_key = None
+        return hit
+
+    def statistics(self):
+        search = self.search
+        return {
+            'ponder_hits': self.hits,
+            'ponder_misses': self.misses,
+            'ponder_depth': search.completed_depth if search is not None else 0,
+            'ponder_nodes': search.nodes if search is not None else 0,
+        }
@@ -0,0 +1,194 @@
+import atexit
+import multiprocessing
+import threading
+import weakref
+
+from .wire import (Message, decode_command_board, decode_error, decode_header, decode_result,
+                   decode_search, encode_command, encode_error, encode_result, encode_search)
+
+
+class EngineError(Exception):
+    pass
+
+
+def serve(conn):
+    # bucla procesului motorului; cautarea ruleaza pe un fir separat ca Stop sa poata fi primit oricand
+    from GameClasses import Minimax
+
+    search_thread = None
+    stop = threading.Event()
+
+    def run_search(request_id, request, stop):
+        def send_info(result):
+            conn.send_bytes(encode_result(Message.Info, request_id, result))
+
+        try:
+            result = Minimax.find_best_result(
+                request['board'], request['depth'], request['maximizing'], request['time_budget'],
+                workers=request['workers'], parallel_mode=request['parallel_mode'],
+                on_iteration=send_info, stop=stop
+            )
+            conn.send_bytes(encode_result(Message.Result, request_id, result))
+        except Exception as e:
+            conn.send_bytes(encode_error(request_id, f"{type(e).__name__}: {e}"))
+
+    def finish_search():
+        if search_thread is not None:
+            stop.set()
+            search_thread.join()
+
+    try:
+        while True:
+            try:
+                data = conn.recv_bytes()
+            except EOFError:
+                break
+            kind, request_id = decode_header(data)
+
+            if kind == Message.Search:
+                finish_search()
+                stop = threading.Event()
+                search_thread = threading.Thread(target=run_search, args=(request_id, decode_search(data), stop))
+                search_thread.start()
+            elif kind == Message.Stop:
+                stop.set()
+            elif kind == Message.Ponder:
+                finish_search()
+                search_thread = None
+                Minimax.start_pondering(decode_command_board(data), Minimax.last_result)
+            elif kind == Message.PonderStop:
+                Minimax.stop_pondering()
+            elif kind == Message.Reset:
+                finish_search()
+                search_thread = None
+                Minimax.reset()
+            elif kind == Message.Quit:
+                break
+    finally:
+        finish_search()
+        Minimax.shutdown()
+        conn.close()
+
+
+def _shutdown_engine(conn, process, timeout=2.0):
+    # trimite Quit si inchide conducta; fara asta procesul copil (care nu e daemon) ramane blocat in
+    # recv_bytes si multiprocessing il asteapta la iesire
+    try:
+        conn.send_bytes(encode_command(Message.Quit))
+    except (BrokenPipeError, OSError):
+        pass
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    conn.close()
+
+
+class EngineProcess:
+    # motorul intr-un proces separat, pornit o singura data; tabela si ordonarea raman calde intre mutari.
+    # Cautarea blocheaza doar firul care o cere, asteptarea pe conducta elibereaza GIL-ul
+
+    POLL_INTERVAL = 0.005
+
+    def __init__(self):
+        # spawn, nu fork: procesul GUI are deja fire de executie Qt pornite
+        self._context = multiprocessing.get_context('spawn')
+        self._conn = None
+        self._process = None
+        # _lock tine o cautare intreaga (cererea si citirea raspunsurilor); _send_lock doar o scriere,
+        # ca mesajele de control din firul GUI sa nu astepte dupa cautare
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._next_request = 0
+        self._finalizer = None
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        with self._send_lock:
+            if self.running:
+                return
+            if self._finalizer is not None:
+                # procesul anterior s-a oprit singur; eliberam conducta lui
+                atexit.unregister(self._finalizer)
+                self._finalizer()
+            conn, child = self._context.Pipe()
+            # nu e daemon: cautarea paralela din motor porneste la randul ei procese
+            self._process = self._context.Process(target=serve, args=(child,), name='tak-engine')
+            self._process.start()
+            child.close()
+            self._conn = conn
+            # orice iesire, nu doar close(): colectarea obiectului sau atexit. Inregistrat dupa
+            # multiprocessing, deci atexit il ruleaza inainte ca multiprocessing sa astepte copilul
+            self._finalizer = weakref.finalize(self, _shutdown_engine, conn, self._process)
+            self._finalizer.atexit = False
+            atexit.register(self._finalizer)
+
+    def close(self, timeout=2.0):
+        if self._process is None:
+            return
+        with self._lock, self._send_lock:
+            self._finalizer.detach()
+            atexit.unregister(self._finalizer)
+            self._finalizer = None
+            _shutdown_engine(self._conn, self._process, timeout)
+            self._conn = None
+            self._process = None
+
+    def _send(self, data):
+        try:
+            with self._send_lock:
+                self._conn.send_bytes(data)
+        except (BrokenPipeError, OSError, AttributeError) as e:
+            raise EngineError(f"procesul motorului nu raspunde: {e}") from e
+
+    def search(self, board, depth=3, time_budget=None, maximizing=True, workers=1, parallel_mode='root',
+               on_iteration=None, stop=None):
+        # acelasi contract ca Minimax.find_best_result; intoarce un SearchResult
+        with self._lock:
+            self.start()
+            self._next_request += 1
+            request_id = self._next_request
+            self._send(encode_search(request_id, board, depth, time_budget, maximizing, workers, parallel_mode))
+
+            stop_sent = False
+            while True:
+                if stop is not None and not stop_sent and stop.is_set():
+                    self._send(encode_command(Message.Stop, request_id))
+                    stop_sent = True
+                try:
+                    if not self._conn.poll(self.POLL_INTERVAL):
+                        if not self._process.is_alive():
+                            raise EngineError("procesul motorului s-a oprit")
+                        continue
+                    data = self._conn.recv_bytes()
+                except (EOFError, OSError) as e:
+                    raise EngineError(f"procesul motorului nu raspunde: {e}") from e
+
+                kind, reply_id = decode_header(data)
+                if reply_id != request_id:
+                    # raspuns intarziat pentru o cerere mai veche
+                    continue
+                if kind == Message.Info:
+                    if on_iteration is not None:
+                        on_iteration(decode_result(data))
+                elif kind == Message.Result:
+                    return decode_result(data)
+                elif kind == Message.Error:
+                    raise EngineError(decode_error(data))
+
+    def ponder(self, board):
+        # board e pozitia de dupa mutarea motorului; predictia vine din ultima cautare
+        self.start()
+        self._send(encode_command(Message.Ponder, board=board))
+
+    # mesajele de control nu iau _lock: se trimit imediat, chiar daca o cautare e in curs
+    def stop_pondering(self):
+        if self.running:
+            self._send(encode_command(Message.PonderStop))
+
+    def reset(self):
+        if self.running:
+            self._send(encode_command(Message.Reset))
@@ -0,0 +1,196 @@
+import sys
+import threading
+
+from GameClasses import Board, Minimax, PlayerType
+from .notation import format_action, format_position, parse_action, parse_position
+from .search import AlphaBetaSearch, WIN_SCORE
+
+# protocol text pe stdin/stdout, in stilul UCI/TEI; un proces tine tabela calda intre cereri
+#
+#   tei                                  -> id ..., teiok
+#   isready                              -> readyok
+#   newgame                              uita tabela si ordonarea
+#   setoption name Workers value N       procese pentru cautare (1 = seriala)
+#   setoption name ParallelMode value root|smp
+#   position startpos [moves m1 m2 ...]  calculatorul (1) muta primul
+#   position tps <pozitie> [moves ...]   vezi engine.notation
+#   go [depth D] [movetime MS] [nodes N] [infinite]
+#   stop                                 -> bestmove cu ce s-a gasit pana acum
+#   d                                    afiseaza pozitia curenta
+#   quit
+#
+# la fiecare iteratie: info depth D score S nodes N nps X time MS pv ...
+# scorul e din perspectiva jucatorului la mutare: cp <valoare>, win sau loss
+
+ENGINE_NAME = "Tak 4x4 alfa-beta"
+MAX_DEPTH = 64
+
+
+class ProtocolEngine:
+
+    def __init__(self, output=None):
+        self.output = output if output is not None else sys.stdout
+        self.board = Board()
+        self.player = PlayerType.Computer
+        self.workers = 1
+        self.parallel_mode = 'root'
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self._stop = threading.Event()
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def handle(self, line):
+        # intoarce False la quit
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        try:
+            if command == 'tei':
+                self.send(f"id name {ENGINE_NAME}")
+                self.send("id author proiect IA")
+                self.send("option name Workers type spin default 1 min 1 max 64")
+                self.send("option name ParallelMode type combo default root var root var smp")
+                self.send("teiok")
+            elif command == 'isready':
+                self.send("readyok")
+            elif command == 'newgame':
+                self.stop_search()
+                Minimax.reset()
+            elif command == 'setoption':
+                self._set_option(args)
+            elif command == 'position':
+                self.stop_search()
+                self._set_position(args)
+            elif command == 'go':
+                self._go(args)
+            elif command == 'stop':
+                self.stop_search()
+            elif command == 'd':
+                self.send(f"info string {format_position(self.board, self.player)}")
+            elif command == 'quit':
+                self.stop_search()
+                return False
+            else:
+                self.send(f"info string comanda necunoscuta: {command}")
+        except ValueError as e:
+            self.send(f"info string eroare: {e}")
+        return True
+
+    def _set_option(self, args):
+        if len(args) != 4 or args[0] != 'name' or args[2] != 'value':
+            raise ValueError("setoption name <nume> value <valoare>")
+        name, value = args[1], args[3]
+        if name == 'Workers':
+            self.workers = max(1, int(value))
+        elif name == 'ParallelMode':
+            if value not in ('root', 'smp'):
+                raise ValueError(f"ParallelMode necunoscut: {value}")
+            self.parallel_mode = value
+        else:
+            raise ValueError(f"optiune necunoscuta: {name}")
+
+    def _set_position(self, args):
+        if 'moves' in args:
+            split = args.index('moves')
+            args, moves = args[:split], args[split + 1:]
+        else:
+            moves = []
+
+        if args[:1] == ['startpos']:
+            board, player = Board(), PlayerType.Computer
+        elif args[:1] == ['tps']:
+            board, player = parse_position(" ".join(args[1:]))
+        else:
+            raise ValueError("position startpos|tps <pozitie> [moves ...]")
+
+        for text in moves:
+            action = parse_action(text, board.size)
+            if not board.is_legal(action, player):
+                raise ValueError(f"mutare ilegala: {text}")
+            board.do_action(action, player)
+            player = AlphaBetaSearch.opponent(player)
+        self.board, self.player = board, player
+
+    def _go(self, args):
+        self.stop_search()
+        depth, time_budget, max_nodes = MAX_DEPTH, None, None
+        index = 0
+        while index < len(args):
+            key = args[index]
+            if key == 'infinite':
+                index += 1
+                continue
+            if index + 1 >= len(args):
+                raise ValueError(f"lipseste valoarea pentru {key}")
+            value = int(args[index + 1])
+            if key == 'depth':
+                depth = value
+            elif key == 'movetime':
+                time_budget = value / 1000
+            elif key == 'nodes':
+                max_nodes = value
+            else:
+                raise ValueError(f"parametru go necunoscut: {key}")
+            index += 2
+
+        self._stop = threading.Event()
+        self._search_thread = threading.Thread(
+            target=self._search, args=(Board(self.board), self.player, depth, time_budget, max_nodes, self._stop),
+            daemon=True
+        )
+        self._search_thread.start()
+
+    def _search(self, board, player, depth, time_budget, max_nodes, stop):
+        sign = 1 if player == PlayerType.Computer else -1
+
+        def send_info(result):
+            stats = result.stats
+            elapsed = stats.get('elapsed', 0.0)
+            pv = " ".join(format_action(action, board.size) for action in result.pv)
+            self.send(f"info depth {result.depth} score {self._format_score(sign * result.score)} "
+                      f"nodes {result.nodes} nps {int(stats.get('nps', 0))} time {int(elapsed * 1000)} pv {pv}")
+
+        try:
+            result = Minimax.find_best_result(board, depth, player == PlayerType.Computer, time_budget,
+                                              workers=self.workers, parallel_mode=self.parallel_mode,
+                                              on_iteration=send_info, stop=stop, max_nodes=max_nodes)
+        except Exception as e:
+            self.send(f"info string eroare in cautare: {type(e).__name__}: {e}")
+            self.send("bestmove none")
+            return
+        move = "none" if result.action is None else format_action(result.action, board.size)
+        self.send(f"bestmove {move}")
+
+    @staticmethod
+    def _format_score(score):
+        if abs(score) >= WIN_SCORE:
+            return "win" if score > 0 else "loss"
+        return f"cp {score}"
+
+    def stop_search(self):
+        if self._search_thread is not None:
+            self._stop.set()
+            self._search_thread.join()
+            self._search_thread = None
+
+
+def main(input_stream=None, output=None):
+    engine = ProtocolEngine(output)
+    stream = input_stream if input_stream is not None else sys.stdin
+    try:
+        for line in stream:
+            if not engine.handle(line):
+                break
+    finally:
+        engine.stop_search()
+        Minimax.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
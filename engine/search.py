@@ -0,0 +1,432 @@
+import time
+
+from GameClasses import Board, PlayerType
+from .ordering import HeuristicOrdering
+from .transposition import Bound, TranspositionTable
+
+WIN_SCORE = 100000
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+
+    def __init__(self, action, score, pv, depth, nodes, player, stats=None):
+        self.action = action
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+        self.nodes = nodes
+        self.player = player
+        # contoarele cautarii, vezi AlphaBetaSearch.statistics
+        self.stats = stats if stats is not None else {}
+
+    def __repr__(self):
+        return (f"SearchResult(action={self.action}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, pv={self.pv})")
+
+
+class AlphaBetaSearch:
+
+    ASPIRATION_WINDOW = 60
+    NULL_MOVE_REDUCTION = 2
+    LMR_MIN_DEPTH = 3
+    LMR_LATE_MOVES = 3
+    QUIESCENCE_DEPTH = 6
+
+    def __init__(self, board, table=None, ordering=None, pvs=False, aspiration=None,
+                 null_move=False, lmr=False, quiescence=False):
+        self.root_board = Board(board)
+        self.board = Board(board)
+        self.table = table
+        self.ordering = ordering if ordering is not None else HeuristicOrdering()
+        # copiii care nu sunt pe varianta principala se cauta cu fereastra nula
+        self.pvs = pvs
+        # latimea ferestrei in jurul scorului iteratiei anterioare; None = fereastra completa
+        self.aspiration = aspiration
+        # mutarea nula exista doar in cautare, nu e o mutare legala in joc
+        self.null_move = null_move
+        self.lmr = lmr
+        # la orizont se continua doar cu actiunile fortate de drumuri
+        self.quiescence = quiescence
+        self.quiescence_nodes = 0
+        self.researches = 0
+        self.null_cutoffs = 0
+        self.reductions = 0
+        self.nodes = 0
+        self.evaluations = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.root_action = None
+        self.deadline = None
+        self.stop = None
+        # limita de noduri; la depasire se opreste ca la expirarea timpului
+        self.max_nodes = None
+        self.completed_depth = 0
+        self.iterations = []
+        self.elapsed = 0.0
+        # apelata cu un SearchResult (mutare, scor, varianta, contoare) dupa fiecare iteratie completa
+        self.on_iteration = None
+
+    @staticmethod
+    def opponent(player):
+        return PlayerType.Human if player == PlayerType.Computer else PlayerType.Computer
+
+    def search(self, depth, player, alpha=float('-inf'), beta=float('inf')):
+        self.root_action = None
+        self.deadline = None
+        if self.table is not None:
+            self.table.new_search()
+        self.ordering.new_search()
+        start = time.perf_counter()
+        score = self._alphabeta(max(depth, 0), 0, alpha, beta, player)
+        self.elapsed = time.perf_counter() - start
+        self.completed_depth = max(depth, 0)
+        return score, self.root_action
+
+    def iterative_deepening(self, player, max_depth, time_budget=None, start_depth=1, new_search=True):
+        if self.table is None:
+            self.table = TranspositionTable()
+        if new_search:
+            self.table.new_search()
+        self.ordering.new_search()
+
+        start = time.perf_counter()
+        self.deadline = None
+        self.completed_depth = 0
+        self.iterations = []
+        best_score, best_action = self.board.evaluation_function(), None
+
+        for depth in range(max(start_depth, 1), max(max_depth, 0) + 1):
+            self.root_action = None
+            try:
+                if self.aspiration is not None and best_action is not None:
+                    score = self._aspiration_search(depth, player, best_score)
+                else:
+                    score = self._alphabeta(depth, 0, float('-inf'), float('inf'), player)
+            except SearchTimeout:
+                self.board = Board(self.root_board)
+                # oprita inainte de prima iteratie completa: cea mai buna mutare gasita pana acum,
+                # altfel prima actiune legala, ca jucatorul sa nu paseze
+                if best_action is None:
+                    best_action = self.root_action
+                if best_action is None:
+                    best_action = next(self.root_board.generate_actions(player), None)
+                break
+
+            best_score, best_action = score, self.root_action
+            self.completed_depth = depth
+            self.elapsed = time.perf_counter() - start
+            self.iterations.append((depth, score, best_action, self.nodes, self.elapsed))
+            if self.on_iteration is not None:
+                self.on_iteration(self.result(best_score, best_action, player))
+            if best_action is None or abs(best_score) >= WIN_SCORE:
+                break
+
+            if time_budget is not None:
+                elapsed = time.perf_counter() - start
+                # iteratia urmatoare dureaza de cateva ori mai mult decat cea curenta
+                if elapsed * 2 > time_budget:
+                    break
+                self.deadline = start + time_budget
+
+        self.deadline = None
+        self.elapsed = time.perf_counter() - start
+        return best_score, best_action
+
+    def statistics(self):
+        table = self.table
+        return {
+            'nodes': self.nodes,
+            'evaluations': self.evaluations,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'tt_probes': table.probes if table is not None else 0,
+            'tt_hits': table.hits if table is not None else 0,
+            'depth': self.completed_depth,
+            'elapsed': self.elapsed,
+            'nps': self.nodes / self.elapsed if self.elapsed else 0.0,
+            # (adancime, scor, noduri, secunde de la inceputul cautarii)
+            'iterations': [(depth, score, nodes, elapsed) for depth, score, action, nodes, elapsed in self.iterations],
+        }
+
+    def _aspiration_search(self, depth, player, previous):
+        delta = self.aspiration
+        alpha, beta = previous - delta, previous + delta
+        while True:
+            score = self._alphabeta(depth, 0, alpha, beta, player)
+            if alpha < score < beta:
+                return score
+            # scorul a iesit din fereastra, cautam din nou cu una mai larga
+            self.researches += 1
+            delta *= 4
+            if score <= alpha:
+                alpha = previous - delta if delta < WIN_SCORE else float('-inf')
+            else:
+                beta = previous + delta if delta < WIN_SCORE else float('inf')
+
+    def search_action(self, action, depth, player, alpha=float('-inf'), beta=float('inf'), time_budget=None):
+        self.deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        undo = self.board.do_action(action, player)
+        try:
+            score = self._alphabeta(max(depth - 1, 0), 1, alpha, beta, self.opponent(player))
+        except SearchTimeout:
+            self.board = Board(self.root_board)
+            raise
+        finally:
+            self.deadline = None
+        self.board.undo_action(undo)
+        return score
+
+    def result(self, score, action, player):
+        return SearchResult(action, score, self.principal_variation(action, player),
+                            self.completed_depth, self.nodes, player, self.statistics())
+
+    def principal_variation(self, action, player):
+        if action is None:
+            return []
+        board = Board(self.root_board)
+        pv = [action]
+        board.do_action(action, player)
+        player = self.opponent(player)
+        seen = {board.zobrist_key(player)}
+
+        while self.table is not None and len(pv) < self.completed_depth:
+            entry = self.table.probe(board.zobrist_key(player))
+            if entry is None or entry[4] is None or not board.is_legal(entry[4], player):
+                break
+            pv.append(entry[4])
+            board.do_action(entry[4], player)
+            player = self.opponent(player)
+            key = board.zobrist_key(player)
+            if key in seen:
+                break
+            seen.add(key)
+        return pv
+
+    def _record_cutoff(self, index, action, player, ply, depth):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        self.ordering.record_cutoff(action, player, ply, depth)
+
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def _check_limits(self):
+        # oprirea ceruta din exterior trebuie sa raspunda in cateva milisecunde
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.stop is not None and self.stop.is_set():
+            raise SearchTimeout()
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchTimeout()
+
+    def _quiescence(self, alpha, beta, player, depth):
+        board = self.board
+        # lanturile de amenintari pot avea mai multe niveluri, deci si aici verificam limitele
+        if not self.nodes & 255:
+            self._check_limits()
+        self.evaluations += 1
+        stand_pat = board.evaluation_function()
+        if depth == 0 or board.summary().finished:
+            return stand_pat
+
+        wins = board.winning_actions(player)
+        if wins:
+            # drumul se completeaza la mutarea asta, nu mai e nimic de cautat
+            undo = board.do_action(wins[0], player)
+            self.evaluations += 1
+            score = board.evaluation_function()
+            board.undo_action(undo)
+            return score
+
+        opponent = self.opponent(player)
+        threats = board.threatened_cells(opponent)
+        if not threats:
+            return stand_pat
+
+        # adversarul castiga la mutarea urmatoare daca nu blocam; o actiune blocheaza daca dupa ea
+        # adversarul nu mai are nicio actiune castigatoare (ocuparea celulei sau capturarea unei plate)
+        maximizing = player == PlayerType.Computer
+        best_score = -WIN_SCORE if maximizing else WIN_SCORE
+        for action in board.generate_actions(player):
+            undo = board.do_action(action, player)
+            if board.winning_actions(opponent):
+                board.undo_action(undo)
+                continue
+            self.nodes += 1
+            self.quiescence_nodes += 1
+            score = self._quiescence(alpha, beta, opponent, depth - 1)
+            board.undo_action(undo)
+            if maximizing:
+                best_score = max(best_score, score)
+                alpha = max(alpha, score)
+            else:
+                best_score = min(best_score, score)
+                beta = min(beta, score)
+            if beta <= alpha:
+                break
+        return best_score
+
+    def _null_move_cutoff(self, depth, ply, alpha, beta, player):
+        reduction = self.NULL_MOVE_REDUCTION
+        if player == PlayerType.Computer:
+            if beta == float('inf'):
+                return False
+            score = self._alphabeta(depth - 1 - reduction, ply + 1, beta - 1, beta, self.opponent(player), False)
+            if score < beta:
+                return False
+            # verificare: cautare redusa cu mutari reale, fara alta mutare nula
+            return self._alphabeta(depth - reduction, ply, beta - 1, beta, player, False) >= beta
+        if alpha == float('-inf'):
+            return False
+        score = self._alphabeta(depth - 1 - reduction, ply + 1, alpha, alpha + 1, self.opponent(player), False)
+        if score > alpha:
+            return False
+        return self._alphabeta(depth - reduction, ply, alpha, alpha + 1, player, False) <= alpha
+
+    def _staged_actions(self, board, player, ply, tt_move, late):
+        # mutarea din tabela se incearca inainte de generarea celorlalte; daca produce o taiere,
+        # restul actiunilor nu mai sunt generate
+        if tt_move is not None:
+            yield tt_move
+        actions = board.legal_actions(player)
+        if tt_move is not None:
+            actions.remove(tt_move)
+        actions = self.ordering.order(board, actions, player, ply, None)
+        late[0] += self.ordering.first_quiet
+        yield from actions
+
+    def _alphabeta(self, depth, ply, alpha, beta, player, null_ok=True):
+        board = self.board
+        table = self.table
+        self.nodes += 1
+        if not self.nodes & 255:
+            self._check_limits()
+
+        if depth <= 0:
+            if self.quiescence:
+                return self._quiescence(alpha, beta, player, self.QUIESCENCE_DEPTH)
+            self.evaluations += 1
+            return board.evaluation_function()
+
+        key = 0
+        tt_move = None
+        if table is not None:
+            key = board.zobrist_key(player)
+            entry = table.probe(key)
+            if entry is not None:
+                tt_move = entry[4]
+                if entry[1] >= depth and ply > 0:
+                    bound, tt_score = entry[2], entry[3]
+                    if bound == Bound.Exact:
+                        return tt_score
+                    if bound == Bound.Lower:
+                        alpha = max(alpha, tt_score)
+                    else:
+                        beta = min(beta, tt_score)
+                    if beta <= alpha:
+                        return tt_score
+
+        finished, winner = board.check_finish()
+        if finished:
+            self.evaluations += 1
+            score = board.evaluation_function()
+            if table is not None:
+                table.store(key, depth, Bound.Exact, score, None)
+            return score
+
+        if tt_move is not None and not board.is_legal(tt_move, player):
+            tt_move = None
+
+        if self.null_move and null_ok and ply > 0 and depth > self.NULL_MOVE_REDUCTION:
+            if self._null_move_cutoff(depth, ply, alpha, beta, player):
+                self.null_cutoffs += 1
+                return beta if player == PlayerType.Computer else alpha
+
+        late = [self.LMR_LATE_MOVES + (tt_move is not None)]
+        actions = self._staged_actions(board, player, ply, tt_move, late)
+        reduce = self.lmr and depth >= self.LMR_MIN_DEPTH
+
+        alpha_orig, beta_orig = alpha, beta
+        opponent = self.opponent(player)
+        best_action = None
+
+        if player == PlayerType.Computer:
+            best_score = float('-inf')
+            for index, action in enumerate(actions):
+                undo = board.do_action(action, player)
+                eval_score = None
+                if reduce and index >= late[0] and alpha > float('-inf'):
+                    # mutarile linistite tarzii se cauta mai putin adanc; daca par bune, se cauta din nou
+                    self.reductions += 1
+                    eval_score = self._alphabeta(depth - 2, ply + 1, alpha, alpha + 1, opponent)
+                    if eval_score > alpha:
+                        eval_score = None
+                if eval_score is None:
+                    if index and self.pvs and alpha > float('-inf'):
+                        eval_score = self._alphabeta(depth - 1, ply + 1, alpha, alpha + 1, opponent)
+                        if alpha < eval_score < beta:
+                            self.researches += 1
+                            eval_score = self._alphabeta(depth - 1, ply + 1, eval_score, beta, opponent)
+                    else:
+                        eval_score = self._alphabeta(depth - 1, ply + 1, alpha, beta, opponent)
+                board.undo_action(undo)
+
+                if eval_score > best_score:
+                    best_score = eval_score
+                    best_action = action
+                    if ply == 0:
+                        self.root_action = action
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    self._record_cutoff(index, action, player, ply, depth)
+                    break
+        else:
+            best_score = float('inf')
+            for index, action in enumerate(actions):
+                undo = board.do_action(action, player)
+                eval_score = None
+                if reduce and index >= late[0] and beta < float('inf'):
+                    # mutarile linistite tarzii se cauta mai putin adanc; daca par bune, se cauta din nou
+                    self.reductions += 1
+                    eval_score = self._alphabeta(depth - 2, ply + 1, beta - 1, beta, opponent)
+                    if eval_score < beta:
+                        eval_score = None
+                if eval_score is None:
+                    if index and self.pvs and beta < float('inf'):
+                        eval_score = self._alphabeta(depth - 1, ply + 1, beta - 1, beta, opponent)
+                        if alpha < eval_score < beta:
+                            self.researches += 1
+                            eval_score = self._alphabeta(depth - 1, ply + 1, alpha, eval_score, opponent)
+                    else:
+                        eval_score = self._alphabeta(depth - 1, ply + 1, alpha, beta, opponent)
+                board.undo_action(undo)
+
+                if eval_score < best_score:
+                    best_score = eval_score
+                    best_action = action
+                    if ply == 0:
+                        self.root_action = action
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    self._record_cutoff(index, action, player, ply, depth)
+                    break
+
+        if best_action is None:
+            self.evaluations += 1
+            return board.evaluation_function()
+
+        if table is not None:
+            if best_score <= alpha_orig:
+                bound = Bound.Upper
+            elif best_score >= beta_orig:
+                bound = Bound.Lower
+            else:
+                bound = Bound.Exact
+            table.store(key, depth, bound, best_score, best_action)
+
+        return best_score
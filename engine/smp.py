@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from .search import AlphaBetaSearch
+from .transposition import SharedTranspositionTable
+
+_helper_table = None
+_helper_stop = None
+
+
+def _init_helper(table_name, size_bits, stop):
+    global _helper_table, _helper_stop
+    _helper_table = SharedTranspositionTable(size_bits, table_name)
+    _helper_stop = stop
+
+
+def _release(stop, table):
+    stop.set()
+    table.close()
+
+
+def _helper_search(board, player, max_depth, start_depth, generation, options):
+    _helper_table.new_search(generation)
+    search = AlphaBetaSearch(board, _helper_table, **options)
+    search.stop = _helper_stop
+    search.iterative_deepening(player, max_depth, start_depth=start_depth, new_search=False)
+    return search.nodes
+
+
+class LazySMPSearch:
+    # toate procesele cauta aceeasi pozitie si isi impart doar tabela de transpozitie
+
+    def __init__(self, helpers=None, size_bits=18):
+        if helpers is None:
+            helpers = (os.cpu_count() or 1) - 1
+        self.helpers = max(0, helpers)
+        self.size_bits = size_bits
+        self._context = multiprocessing.get_context('spawn')
+        self._stop = self._context.Event()
+        self.table = SharedTranspositionTable(size_bits)
+        self._executor = None
+        self._generation = 0
+        self.nodes = 0
+        self.iterations = []
+        # argumentele AlphaBetaSearch pentru firul principal si ajutoare, vezi Minimax.search_options
+        self.options = {}
+        # tabela din memoria partajata nu trebuie sa depinda de un apel explicit la close()
+        self._finalizer = weakref.finalize(self, _release, self._stop, self.table)
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.helpers, mp_context=self._context,
+                initializer=_init_helper, initargs=(self.table.name, self.size_bits, self._stop)
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._stop.set()
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._finalizer()
+        self.table = None
+
+    def iterative_deepening(self, board, player, max_depth, time_budget=None, stop=None, on_iteration=None):
+        self._generation += 1
+        self.table.new_search(self._generation)
+        self._stop.clear()
+
+        futures = []
+        if self.helpers:
+            pool = self._pool()
+            for helper in range(self.helpers):
+                # jumatate din ajutoare pornesc cu o adancime in fata
+                start_depth = 2 + helper % 2
+                futures.append(pool.submit(_helper_search, board, player, max_depth + 1,
+                                           start_depth, self._generation, self.options))
+
+        search = AlphaBetaSearch(board, self.table, **self.options)
+        # ajutoarele se opresc prin _stop imediat ce firul principal se termina
+        search.stop = stop
+        search.on_iteration = on_iteration
+        try:
+            score, action = search.iterative_deepening(player, max_depth, time_budget, new_search=False)
+        finally:
+            self._stop.set()
+
+        self.nodes = search.nodes + sum(future.result() for future in futures)
+        self.iterations = search.iterations
+        result = search.result(score, action, player)
+        result.nodes = self.nodes
+        # contoarele detaliate sunt ale firului principal, nodurile includ ajutoarele
+        result.stats['nodes'] = self.nodes
+        if search.elapsed:
+            result.stats['nps'] = self.nodes / search.elapsed
+        return result
@@ -0,0 +1,189 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+
+from GameClasses import Minimax, PlayerType
+from .benchmark import POSITIONS, build_position
+from .transposition import TranspositionTable
+
+# 2: peak_memory_kb nu mai include tabela de transpozitie, raportata separat in table_memory_kb
+SUITE_VERSION = 2
+DIFFICULTY_DEPTHS = [2, 3, 4, 5]
+DEFAULT_THRESHOLD = 0.20
+
+
+def find_next_board(board, depth, player):
+    Minimax.find_next_board(board, depth, maximizing=player == PlayerType.Computer)
+    return Minimax.last_result
+
+
+def find_best_action(board, depth, player):
+    from ui.minimax_wrapper import MinimaxWithPlacement
+
+    # find_best_action afiseaza mutarea aleasa, nu vrem asta in masuratori
+    with redirect_stdout(StringIO()):
+        MinimaxWithPlacement.find_best_action(board, depth, player)
+    return Minimax.last_result
+
+
+def unavailable_reason(target_name):
+    # pachetul ui importa PyQt6, care poate lipsi sau nu se poate incarca pe o masina fara ecran;
+    # importul se incearca abia cand tinta e ceruta, iar fara el se masoara doar motorul
+    if target_name != 'find_best_action':
+        return None
+    try:
+        import ui.minimax_wrapper
+    except (ImportError, OSError, RuntimeError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+TARGETS = {
+    'find_next_board': find_next_board,
+    'find_best_action': find_best_action,
+}
+
+
+def measure(target, board, depth, player, repeat, memory):
+    best_time = None
+    for _ in range(repeat):
+        # fiecare masurare porneste cu tabela de transpozitie si ordonarea goale
+        Minimax.reset()
+        start = time.perf_counter()
+        result = target(board, depth, player)
+        elapsed = time.perf_counter() - start
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+
+    peak = table_size = None
+    if memory:
+        Minimax.reset()
+        tracemalloc.start()
+        # tabela goala (2^18 intrari) se aloca inainte, altfel ar acoperi tot ce aloca cautarea
+        Minimax.table = TranspositionTable()
+        table_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        target(board, depth, player)
+        peak = tracemalloc.get_traced_memory()[1] - table_size
+        tracemalloc.stop()
+
+    return {
+        'nodes': result.nodes,
+        'wall_time': best_time,
+        'nps': result.nodes / best_time if best_time else 0.0,
+        'peak_memory_kb': None if peak is None else peak / 1024,
+        'table_memory_kb': None if table_size is None else table_size / 1024,
+        'action': result.action,
+        'score': result.score,
+    }
+
+
+def run_suite(depths, positions=None, targets=None, repeat=1, memory=True):
+    results = []
+    for target_name in targets or TARGETS:
+        reason = unavailable_reason(target_name)
+        if reason is not None:
+            print(f"{target_name}: sarit, pachetul ui nu se poate importa ({reason})", file=sys.stderr)
+            continue
+        target = TARGETS[target_name]
+        for name in positions or POSITIONS:
+            board, player = build_position(POSITIONS[name])
+            for depth in depths:
+                case = {'name': f"{target_name}/{name}/d{depth}", 'target': target_name,
+                        'position': name, 'depth': depth}
+                case.update(measure(target, board, depth, player, repeat, memory))
+                results.append(case)
+                print_case(case)
+    return {
+        'version': SUITE_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def print_case(case):
+    memory = '-' if case['peak_memory_kb'] is None else f"{case['peak_memory_kb']:.0f}"
+    print(f"{case['name']:<32} {case['nodes']:>9} {case['wall_time']:>8.3f} {case['nps']:>9.0f} {memory:>9}")
+
+
+def compare(baseline, current, threshold):
+    # intoarce regresiile: (caz, metrica, valoare veche, valoare noua)
+    regressions = []
+    old_cases = {case['name']: case for case in baseline['results']}
+    print(f"{'caz':<32} {'noduri':>16}  {'timp s':>16}  {'noduri/s':>16}  {'memorie KB':>16}")
+    for case in current['results']:
+        old = old_cases.get(case['name'])
+        if old is None:
+            print(f"{case['name']:<32} nou")
+            continue
+        flags = []
+        for metric, higher_is_worse in (('nodes', True), ('wall_time', True), ('nps', False),
+                                        ('peak_memory_kb', True)):
+            before, after = old.get(metric), case.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if (change if higher_is_worse else -change) > threshold:
+                flags.append(metric)
+                regressions.append((case['name'], metric, before, after))
+        line = f"{case['name']:<32}"
+        for metric in ('nodes', 'wall_time', 'nps', 'peak_memory_kb'):
+            before, after = old.get(metric), case.get(metric)
+            if not before or after is None:
+                line += f" {'-':>17}"
+            else:
+                line += f" {after / before - 1:>+16.1%}{'!' if metric in flags else ' '}"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suita de masuratori pentru motor, cu comparatie fata de o referinta")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="ruleaza suita si scrie rezultatele JSON")
+    compare_parser = commands.add_parser('compare', help="compara cu o referinta salvata")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current', nargs='?', help="rezultate salvate; lipsa = ruleaza suita acum")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="cresterea relativa acceptata (implicit 0.20)")
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--output', help="fisierul JSON pentru rezultate")
+        sub.add_argument('--depths', nargs='+', type=int, default=DIFFICULTY_DEPTHS)
+        sub.add_argument('--position', action='append', choices=sorted(POSITIONS))
+        sub.add_argument('--target', action='append', choices=sorted(TARGETS))
+        sub.add_argument('--repeat', type=int, default=3, help="se pastreaza cel mai bun timp")
+        sub.add_argument('--no-memory', action='store_true', help="fara masurarea memoriei (tracemalloc)")
+    args = parser.parse_args()
+
+    if args.command == 'compare' and args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        print(f"{'caz':<32} {'noduri':>9} {'timp s':>8} {'noduri/s':>9} {'mem KB':>9}")
+        current = run_suite(args.depths, args.position, args.target, args.repeat, not args.no_memory)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(baseline, current, args.threshold)
+        for name, metric, before, after in regressions:
+            print(f"REGRESIE {name}: {metric} {before:.6g} -> {after:.6g}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import random
+
+from GameClasses import ActionKind, Board, PlayerType, decode_action
+from .search import AlphaBetaSearch
+
+
+# compara detectorul de drumuri dintr-o mutare (Board.winning_actions, road_threats, threatened_cells)
+# cu varianta directa: fiecare actiune legala facuta, verificata cu has_road si desfacuta
+
+
+def brute_winning_actions(board, player):
+    wins = set()
+    for action in board.legal_actions(player):
+        undo = board.do_action(action, player)
+        if board.has_road(player):
+            wins.add(action)
+        board.undo_action(undo)
+    return wins
+
+
+def check_position(board, player):
+    # intoarce lista diferentelor gasite; goala daca detectorul e corect
+    errors = []
+    expected = brute_winning_actions(board, player)
+    found = board.winning_actions(player)
+    if set(found) != expected or len(found) != len(expected):
+        errors.append(f"winning_actions: {sorted(found)} in loc de {sorted(expected)}")
+
+    placements = 0
+    cells = 0
+    for action in expected:
+        kind, source, target = decode_action(action)
+        if kind == ActionKind.Move:
+            cells |= 1 << source | 1 << target
+        else:
+            placements |= 1 << source
+            cells |= 1 << source
+    if board.road_threats(player) != placements:
+        errors.append(f"road_threats: {board.road_threats(player):#x} in loc de {placements:#x}")
+    if board.threatened_cells(player) != cells:
+        errors.append(f"threatened_cells: {board.threatened_cells(player):#x} in loc de {cells:#x}")
+    return errors
+
+
+def run(games=300, seed=1, max_plies=40):
+    rng = random.Random(seed)
+    checked = threats = failures = 0
+    for game in range(games):
+        board, player = Board(), PlayerType.Computer
+        for ply in range(max_plies):
+            if board.check_finish()[0]:
+                break
+            for side in (PlayerType.Computer, PlayerType.Human):
+                errors = check_position(board, side)
+                checked += 1
+                threats += bool(board.winning_actions(side))
+                if errors:
+                    failures += 1
+                    print(f"joc {game}, mutarea {ply}, jucator {side}:")
+                    for error in errors:
+                        print(f"  {error}")
+            actions = board.legal_actions(player)
+            if not actions:
+                break
+            board.do_action(rng.choice(actions), player)
+            player = AlphaBetaSearch.opponent(player)
+    print(f"{checked} pozitii verificate, {threats} cu drum dintr-o mutare, {failures} diferente")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica detectorul de drumuri dintr-o mutare prin cautare directa")
+    parser.add_argument('--games', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if run(args.games, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
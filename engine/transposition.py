@@ -0,0 +1,152 @@
+import weakref
+
+
+class Bound:
+    Exact = 0
+    Lower = 1
+    Upper = 2
+
+
+class TranspositionTable:
+    # intrare: (cheie, adancime, tip limita, scor, mutare, generatie)
+
+    def __init__(self, size_bits=18):
+        self.size_bits = size_bits
+        self.mask = (1 << size_bits) - 1
+        self.slots = [None] * (1 << size_bits)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        self.generation += 1
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        self.slots = [None] * (1 << self.size_bits)
+        self.generation = 0
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        index = key & self.mask
+        entry = self.slots[index]
+        if entry is not None:
+            if entry[0] == key:
+                if depth < entry[1] and bound != Bound.Exact:
+                    return
+                if move is None:
+                    move = entry[4]
+            elif entry[5] == self.generation and depth < entry[1]:
+                # pastram intrarea mai adanca din cautarea curenta
+                return
+        self.slots[index] = (key, depth, bound, score, move, self.generation)
+        self.stores += 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def usage(self):
+        sample = self.slots[:1000]
+        return sum(1 for entry in sample if entry is not None) / len(sample)
+
+
+class SharedTranspositionTable:
+    # doua cuvinte de 64 de biti pe intrare: (cheie ^ date, date), fara blocare;
+    # o scriere intrerupta de alt proces nu mai verifica cheia si e ignorata
+    SCORE_OFFSET = 1 << 31
+    VALID = 1 << 2
+
+    def __init__(self, size_bits=18, name=None):
+        from multiprocessing import shared_memory
+
+        self.size_bits = size_bits
+        self.mask = (1 << size_bits) - 1
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=16 << size_bits)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.slots = self.memory.buf.cast('Q')
+        # segmentul se elibereaza si daca nimeni nu apeleaza close(): la colectare sau la iesire
+        self._finalizer = weakref.finalize(self, self._release, self.slots, self.memory, self.owner)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self, generation=None):
+        self.generation = self.generation + 1 if generation is None else generation
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        self.memory.buf[:] = bytes(len(self.memory.buf))
+
+    def close(self):
+        self._finalizer()
+
+    @staticmethod
+    def _release(slots, memory, owner):
+        # vederea peste buffer trebuie eliberata inainte, altfel close da BufferError
+        slots.release()
+        memory.close()
+        if owner:
+            memory.unlink()
+
+    @staticmethod
+    def _encode_move(move):
+        if move is None:
+            return 0
+        return 1 + move
+
+    @staticmethod
+    def _decode_move(code):
+        if code == 0:
+            return None
+        return code - 1
+
+    def probe(self, key):
+        self.probes += 1
+        index = (key & self.mask) << 1
+        data = self.slots[index + 1]
+        if not data & self.VALID or self.slots[index] ^ data != key:
+            return None
+        self.hits += 1
+        return (key, (data >> 8) & 0xFF, data & 3, (data >> 32) - self.SCORE_OFFSET,
+                self._decode_move((data >> 16) & 0xFFFF), (data >> 3) & 0x1F)
+
+    def store(self, key, depth, bound, score, move):
+        index = (key & self.mask) << 1
+        slots = self.slots
+        data = slots[index + 1]
+        if data & self.VALID:
+            same_key = slots[index] ^ data == key
+            stored_depth = (data >> 8) & 0xFF
+            if same_key:
+                if depth < stored_depth and bound != Bound.Exact:
+                    return
+                if move is None:
+                    move = self._decode_move((data >> 16) & 0xFFFF)
+            elif (data >> 3) & 0x1F == self.generation & 0x1F and depth < stored_depth:
+                return
+        data = ((int(score) + self.SCORE_OFFSET) << 32 | self._encode_move(move) << 16
+                | min(depth, 0xFF) << 8 | (self.generation & 0x1F) << 3 | self.VALID | bound)
+        slots[index] = key ^ data
+        slots[index + 1] = data
+        self.stores += 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
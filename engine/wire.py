@@ -0,0 +1,180 @@
+import struct
+
+from GameClasses import Board, PieceType, PlayerType
+from .search import SearchResult
+
+# mesajele dintre GUI si procesul motorului: un octet de tip, apoi campuri fixe impachetate cu struct
+
+
+class Message:
+    Search = 1
+    Stop = 2
+    Ponder = 3
+    PonderStop = 4
+    Reset = 5
+    Quit = 6
+    # raspunsuri
+    Info = 10
+    Result = 11
+    Error = 12
+
+
+NO_ACTION = 0xFFFF
+NO_TIME = -1.0
+
+_HEADER = struct.Struct('<BI')
+_SEARCH = struct.Struct('<BBdBB')
+_RESULT = struct.Struct('<BHdQH')
+_ITERATION = struct.Struct('<BdQd')
+
+# contoarele din SearchResult.stats care trec prin conducta; lipsa lor e marcata in masca
+STAT_FIELDS = [
+    ('nodes', 'Q'),
+    ('evaluations', 'Q'),
+    ('cutoffs', 'Q'),
+    ('first_move_cutoffs', 'Q'),
+    ('tt_probes', 'Q'),
+    ('tt_hits', 'Q'),
+    ('depth', 'Q'),
+    ('elapsed', 'd'),
+    ('nps', 'd'),
+    ('ponder_hits', 'Q'),
+    ('ponder_misses', 'Q'),
+    ('ponder_depth', 'Q'),
+    ('ponder_nodes', 'Q'),
+    ('ponder_hit', '?'),
+]
+_STATS = struct.Struct('<H' + ''.join(code for name, code in STAT_FIELDS))
+
+PARALLEL_MODES = ['root', 'smp']
+
+
+def encode_board(board):
+    # marime, numar de piese, rezervele, (proprietar << 1 | tip) pentru fiecare piesa, apoi stivele
+    reserves = [board.available_pieces[player][piece_type]
+                for player in (PlayerType.Computer, PlayerType.Human)
+                for piece_type in (PieceType.Flat, PieceType.Standing)]
+    data = bytearray([board.size, board.next_piece_id, *reserves])
+    data.extend(board.piece_owner[piece_id] << 1 | board.piece_type[piece_id]
+                for piece_id in range(board.next_piece_id))
+    for stack in board.stacks:
+        data.append(len(stack))
+        data.extend(stack)
+    return bytes(data)
+
+
+def decode_board(data, offset=0):
+    size, count = data[offset], data[offset + 1]
+    reserves = data[offset + 2:offset + 6]
+    offset += 6
+    pieces = data[offset:offset + count]
+    offset += count
+
+    stacks = []
+    for cell in range(size * size):
+        height = data[offset]
+        stacks.append([(pieces[piece_id] >> 1, pieces[piece_id] & 1)
+                       for piece_id in data[offset + 1:offset + 1 + height]])
+        offset += 1 + height
+
+    board = Board.from_stacks(size, stacks, {
+        PlayerType.Computer: {PieceType.Flat: reserves[0], PieceType.Standing: reserves[1]},
+        PlayerType.Human: {PieceType.Flat: reserves[2], PieceType.Standing: reserves[3]},
+    })
+    return board, offset
+
+
+def decode_header(data):
+    return _HEADER.unpack_from(data)
+
+
+def encode_search(request_id, board, depth, time_budget=None, maximizing=True, workers=1, parallel_mode='root'):
+    return (_HEADER.pack(Message.Search, request_id)
+            + _SEARCH.pack(depth, maximizing, NO_TIME if time_budget is None else time_budget,
+                           workers, PARALLEL_MODES.index(parallel_mode))
+            + encode_board(board))
+
+
+def decode_search(data):
+    depth, maximizing, time_budget, workers, mode = _SEARCH.unpack_from(data, _HEADER.size)
+    board, offset = decode_board(data, _HEADER.size + _SEARCH.size)
+    return {
+        'board': board,
+        'depth': depth,
+        'maximizing': bool(maximizing),
+        'time_budget': None if time_budget < 0 else time_budget,
+        'workers': workers,
+        'parallel_mode': PARALLEL_MODES[mode],
+    }
+
+
+def encode_command(kind, request_id=0, board=None):
+    data = _HEADER.pack(kind, request_id)
+    if board is not None:
+        data += encode_board(board)
+    return data
+
+
+def decode_command_board(data):
+    return decode_board(data, _HEADER.size)[0]
+
+
+def encode_result(kind, request_id, result):
+    # folosit si pentru Info (iteratii intermediare) si pentru Result
+    stats = result.stats or {}
+    action = NO_ACTION if result.action is None else result.action
+    data = bytearray(_HEADER.pack(kind, request_id))
+    data += _RESULT.pack(result.player, action, result.score, result.nodes, len(result.pv))
+    data += struct.pack(f'<{len(result.pv)}H', *result.pv)
+    data += struct.pack('<B', result.depth)
+
+    present = 0
+    values = []
+    for index, (name, code) in enumerate(STAT_FIELDS):
+        value = stats.get(name)
+        if value is not None:
+            present |= 1 << index
+        values.append((value or 0) if code != '?' else bool(value))
+    data += _STATS.pack(present, *values)
+
+    iterations = stats.get('iterations', [])
+    data += struct.pack('<B', len(iterations))
+    for depth, score, nodes, elapsed in iterations:
+        data += _ITERATION.pack(depth, score, nodes, elapsed)
+    return bytes(data)
+
+
+def decode_result(data):
+    offset = _HEADER.size
+    player, action, score, nodes, pv_length = _RESULT.unpack_from(data, offset)
+    offset += _RESULT.size
+    pv = list(struct.unpack_from(f'<{pv_length}H', data, offset))
+    offset += 2 * pv_length
+    depth = data[offset]
+    offset += 1
+
+    present, *values = _STATS.unpack_from(data, offset)
+    offset += _STATS.size
+    stats = {name: value for index, ((name, code), value) in enumerate(zip(STAT_FIELDS, values))
+             if present >> index & 1}
+
+    iterations = []
+    for index in range(data[offset]):
+        depth_i, score_i, nodes_i, elapsed_i = _ITERATION.unpack_from(data, offset + 1 + index * _ITERATION.size)
+        iterations.append((depth_i, _score(score_i), nodes_i, elapsed_i))
+    stats['iterations'] = iterations
+
+    return SearchResult(None if action == NO_ACTION else action, _score(score), pv, depth, nodes, player, stats)
+
+
+def _score(value):
+    # scorurile evaluarii sunt intregi, dar trec prin conducta ca double
+    return int(value) if value.is_integer() else value
+
+
+def encode_error(request_id, message):
+    return _HEADER.pack(Message.Error, request_id) + message.encode('utf-8')
+
+
+def decode_error(data):
+    return data[_HEADER.size:].decode('utf-8')
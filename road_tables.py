@@ -0,0 +1,88 @@
+import mmap
+import os
+import struct
+import sys
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'road_cache')
+# tabelele mai mari de atat se genereaza doar explicit, din linia de comanda
+AUTO_GENERATE_MAX_SIZE = 4
+ROAD_FLAG = 0x80
+LENGTH_MASK = 0x7F
+# antetul de la sfarsitul fisierului: marcaj, versiune, marimea tablei si constantele intrarilor;
+# un fisier ramas de la alt format se regenereaza. Cresteti TABLE_VERSION cand se schimba numerotarea
+# celulelor in masca (celula = x * size + y) sau felul in care se calculeaza intrarile
+TABLE_MAGIC = b'TAKROADS'
+TABLE_VERSION = 1
+_HEADER = struct.Struct('<8sHBBB3x')
+
+
+def table_path(size):
+    return os.path.join(CACHE_DIR, f"roads_{size}x{size}.bin")
+
+
+def generate(geometry):
+    cells = geometry.size * geometry.size
+    table = bytearray(1 << cells)
+    for mask in range(1, 1 << cells):
+        entry = geometry.longest_road(mask)
+        if entry >= geometry.size and geometry.has_road(mask):
+            entry |= ROAD_FLAG
+        table[mask] = entry
+    return table
+
+
+def _header(size):
+    return _HEADER.pack(TABLE_MAGIC, TABLE_VERSION, size, ROAD_FLAG, LENGTH_MASK)
+
+
+def save(size, table):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = table_path(size)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(table)
+        f.write(_header(size))
+    os.replace(temp_path, path)
+
+
+def _map(path, size):
+    # antetul e dupa intrari, ca tabela mapata sa se indexeze direct cu masca
+    length = 1 << (size * size)
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != length + _HEADER.size:
+                return None
+            f.seek(length)
+            if f.read(_HEADER.size) != _header(size):
+                return None
+            return mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+
+def load(geometry):
+    size = geometry.size
+    table = _map(table_path(size), size)
+    if table is not None or size > AUTO_GENERATE_MAX_SIZE:
+        return table
+
+    generated = generate(geometry)
+    try:
+        save(size, generated)
+    except OSError:
+        return bytes(generated)
+    return _map(table_path(size), size) or bytes(generated)
+
+
+def main():
+    from GameClasses import BitGeometry
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [4]
+    for size in sizes:
+        print(f"generez tabela de drumuri {size}x{size} ({1 << (size * size)} intrari)...")
+        save(size, generate(BitGeometry(size)))
+        print(f"  -> {table_path(size)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from .timer_widget import TimerWidget
 from .difficulty_dialog import DifficultyDialog
 from .start_dialog import StartDialog
 from .minimax_worker import MinimaxWorker, WorkerSignals
+from .search_stats_widget import SearchStatsWidget
 
 __all__ = [
     'Action',
@@ -22,5 +23,6 @@ __all__ = [
     'DifficultyDialog',
     'StartDialog',
     'MinimaxWorker',
-    'WorkerSignals'
+    'WorkerSignals',
+    'SearchStatsWidget'
 ]
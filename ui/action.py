@@ -1,5 +1,5 @@
 
-from GameClasses import PieceType, PlayerType
+from GameClasses import PieceType, PlayerType, ActionKind, decode_action
 
 
 class ActionType:
@@ -25,6 +25,16 @@ class Action:
             self.player = None
             self.piece_type = None
 
+    @staticmethod
+    def from_engine_action(board, action, player):
+        if action is None:
+            return None
+        kind, cell, piece_type = decode_action(action)
+        if kind == ActionKind.Place:
+            x, y = divmod(cell, board.size)
+            return Action(ActionType.PLACEMENT, x=x, y=y, player=player, piece_type=piece_type)
+        return Action(ActionType.MOVEMENT, move=board.action_to_move(action))
+
     def apply_to_board(self, board):
         if self.action_type == ActionType.PLACEMENT:
             return board.place_piece(self.x, self.y, self.player, self.piece_type)
@@ -44,42 +54,7 @@ class Action:
 
 
 def generate_all_actions(board, player):
-    actions = []
-
-    if board.has_pieces_available(player):
-        for x in range(board.size):
-            for y in range(board.size):
-                pieces_here = [p for p in board.pieces if p.x == x and p.y == y]
-                has_standing = any(p.type == PieceType.Standing for p in pieces_here)
-                position_empty = len(pieces_here) == 0
-
-                # standing poate fi plasat doar pe pozitii goala
-                if board.available_pieces[player][PieceType.Standing] > 0 and position_empty:
-                    actions.append(Action(
-                        ActionType.PLACEMENT,
-                        x=x,
-                        y=y,
-                        player=player,
-                        piece_type=PieceType.Standing
-                    ))
-
-                # flat poate fi plasat pe pozitii goale SAU peste alte piese flat
-                # nu poate fi plasat pe standing
-                if board.available_pieces[player][PieceType.Flat] > 0 and not has_standing:
-                    actions.append(Action(
-                        ActionType.PLACEMENT,
-                        x=x,
-                        y=y,
-                        player=player,
-                        piece_type=PieceType.Flat
-                    ))
-
-    for piece in board.pieces:
-        if piece.player == player:
-            for move in piece.valid_moves(board):
-                actions.append(Action(ActionType.MOVEMENT, move=move))
-
-    return actions
+    return [Action.from_engine_action(board, action, player) for action in board.generate_actions(player)]
 
 
 def count_actions_by_type(actions):
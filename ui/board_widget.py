@@ -46,12 +46,16 @@ class BoardWidget(QWidget):
         self.animation_running = False
         self.placement_mode = False
         self.placement_piece_type = None
+        # celulele unde calculatorul completeaza un drum dintr-o mutare
+        self.show_danger = True
+        self.danger_cells = self.board.threatened_cells(PlayerType.Computer)
 
         self.setMinimumSize(self.BOARD_SIZE, self.BOARD_SIZE)
         self.setMaximumSize(self.BOARD_SIZE, self.BOARD_SIZE)
 
     def set_board(self, board):
         self.board = board
+        self.danger_cells = board.threatened_cells(PlayerType.Computer)
         self.selected_piece_id = None
         self.valid_moves = []
         self.update()
@@ -60,11 +64,7 @@ class BoardWidget(QWidget):
         self.selected_piece_id = piece_id
 
         if piece_id is not None:
-            piece = None
-            for p in self.board.pieces:
-                if p.id == piece_id:
-                    piece = p
-                    break
+            piece = self.board.get_piece(piece_id)
 
             if piece:
                 self.valid_moves = piece.valid_moves(self.board)
@@ -92,20 +92,17 @@ class BoardWidget(QWidget):
 
     def get_empty_positions(self):
         empty_positions = []
-        for x in range(4):
-            for y in range(4):
-                if self.board.is_position_empty(x, y):
-                    empty_positions.append((x, y))
+        empty = self.board.placement_cells()
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            empty_positions.append(divmod(bit.bit_length() - 1, self.board.size))
         return empty_positions
 
     def animate_move(self, move, callback=None):
         self.animation_running = True
 
-        piece = None
-        for p in self.board.pieces:
-            if p.id == move.piece_id:
-                piece = p
-                break
+        piece = self.board.get_piece(move.piece_id)
 
         if not piece:
             self.animation_running = False
@@ -153,19 +150,8 @@ class BoardWidget(QWidget):
         y = 3 - (event.pos().y() // self.CELL_SIZE)
 
         if self.placement_mode and self.placement_piece_type is not None:
-            pieces_here = [p for p in self.board.pieces if p.x == x and p.y == y]
-            has_standing = any(p.type == PieceType.Standing for p in pieces_here)
-            position_empty = len(pieces_here) == 0
-
-            # standing poate fi plasat doar pe pozitii goala
-            if self.placement_piece_type == PieceType.Standing:
-                if position_empty:
-                    self.placementRequested.emit(x, y, self.placement_piece_type)
-            # flat poate fi plasat pe pozitii goale SAU peste alte piese flat
-             # nu poate fi plasat pe standing
-            elif self.placement_piece_type == PieceType.Flat:
-                if not has_standing:
-                    self.placementRequested.emit(x, y, self.placement_piece_type)
+            if self.board.can_place(x, y, PlayerType.Human, self.placement_piece_type):
+                self.placementRequested.emit(x, y, self.placement_piece_type)
             return
 
         if self.selected_piece_id is not None:
@@ -174,9 +160,8 @@ class BoardWidget(QWidget):
                     self.moveRequested.emit(move)
                     return
 
-        pieces_at_position = [p for p in self.board.pieces if p.x == x and p.y == y]
-        if pieces_at_position:
-            top_piece = max(pieces_at_position, key=lambda p: p.id)
+        top_piece = self.board.get_top_piece(x, y)
+        if top_piece is not None:
             self.pieceClicked.emit(top_piece.id)
             return
 
@@ -188,6 +173,8 @@ class BoardWidget(QWidget):
 
         self._draw_board(painter)
 
+        self._draw_danger(painter)
+
         self._draw_valid_move_indicators(painter)
 
         self._draw_pieces(painter)
@@ -221,6 +208,26 @@ class BoardWidget(QWidget):
                 self.BOARD_SIZE, i * self.CELL_SIZE
             )
 
+    def _draw_danger(self, painter):
+        if not self.show_danger:
+            return
+
+        cells = self.danger_cells
+        while cells:
+            bit = cells & -cells
+            cells ^= bit
+            x, y = divmod(bit.bit_length() - 1, self.board.size)
+
+            color = QColor("#E53935")
+            color.setAlpha(60)
+            painter.fillRect(
+                x * self.CELL_SIZE,
+                (3 - y) * self.CELL_SIZE,
+                self.CELL_SIZE,
+                self.CELL_SIZE,
+                color
+            )
+
     def _draw_valid_move_indicators(self, painter):
         if self.placement_mode and self.placement_piece_type is not None:
             empty_positions = self.get_empty_positions()
@@ -259,57 +266,59 @@ class BoardWidget(QWidget):
             )
 
     def _draw_pieces(self, painter):
-        sorted_pieces = sorted(self.board.pieces, key=lambda p: p.id, reverse=False)
+        animated_stacked = []
 
-        for piece in sorted_pieces:
-            if piece.id in self.animated_pieces:
-                animated = self.animated_pieces[piece.id]
-                draw_x = animated.x
-                draw_y = animated.y
-            else:
-                draw_x = piece.x
-                draw_y = piece.y
+        for x in range(self.board.size):
+            for y in range(self.board.size):
+                stack = self.board.get_stack(x, y)
+                for stack_level, piece in enumerate(stack):
+                    if stack_level > 0:
+                        print(f"[DEBUG DRAW] Piece ID={piece.id} at ({piece.x},{piece.y}): stack_level={stack_level}, piese dedesubt={[p.id for p in stack[:stack_level]]}")
 
-            pieces_below = [p for p in sorted_pieces if p.x == draw_x and p.y == draw_y and p.id < piece.id]
-            stack_level = len(pieces_below)
+                    if piece.id in self.animated_pieces:
+                        animated_stacked.append((piece, stack_level))
+                        continue
+                    self._draw_piece(painter, piece, piece.x, piece.y, stack_level)
 
-            if stack_level > 0:
-                print(f"[DEBUG DRAW] Piece ID={piece.id} at ({piece.x},{piece.y}): stack_level={stack_level}, piese dedesubt={[p.id for p in pieces_below]}")
+        for piece, stack_level in animated_stacked:
+            animated = self.animated_pieces[piece.id]
+            self._draw_piece(painter, piece, animated.x, animated.y, stack_level)
 
-            stack_offset = stack_level * 8
+    def _draw_piece(self, painter, piece, draw_x, draw_y, stack_level):
+        stack_offset = stack_level * 8
 
-            pixel_x = int(draw_x * self.CELL_SIZE + self.PIECE_MARGIN + stack_offset)
-            pixel_y = int((3 - draw_y) * self.CELL_SIZE + self.PIECE_MARGIN - stack_offset)
-            pixel_width = self.CELL_SIZE - 2 * self.PIECE_MARGIN
+        pixel_x = int(draw_x * self.CELL_SIZE + self.PIECE_MARGIN + stack_offset)
+        pixel_y = int((3 - draw_y) * self.CELL_SIZE + self.PIECE_MARGIN - stack_offset)
+        pixel_width = self.CELL_SIZE - 2 * self.PIECE_MARGIN
 
-            if piece.type == PieceType.Flat:
-                pixel_height = pixel_width
-            else:
-                pixel_height = pixel_width // 2  
-
-            if piece.player == PlayerType.Computer:
-                gradient = QLinearGradient(pixel_x, pixel_y, pixel_x, pixel_y + pixel_height)
-                gradient.setColorAt(0, QColor("#E53935"))  # rosu deschis
-                gradient.setColorAt(1, QColor("#C62828"))  # rosu inchis
-                brush = QBrush(gradient)
-                border_color = QColor("#B71C1C")
-            else: 
-                gradient = QLinearGradient(pixel_x, pixel_y, pixel_x, pixel_y + pixel_height)
-                gradient.setColorAt(0, QColor("#2196F3"))  # albastru deschis
-                gradient.setColorAt(1, QColor("#1565C0"))  # albastru inchis
-                brush = QBrush(gradient)
-                border_color = QColor("#0D47A1")
-
-            if piece.id == self.selected_piece_id:
-                border_color = QColor("#FFC107")
-                border_width = 4
-            else:
-                border_width = 2
-
-            painter.setPen(QPen(border_color, border_width))
-            painter.setBrush(brush)
-            painter.drawRoundedRect(
-                pixel_x, pixel_y,
-                pixel_width, pixel_height,
-                8, 8  
-            )
+        if piece.type == PieceType.Flat:
+            pixel_height = pixel_width
+        else:
+            pixel_height = pixel_width // 2  
+
+        if piece.player == PlayerType.Computer:
+            gradient = QLinearGradient(pixel_x, pixel_y, pixel_x, pixel_y + pixel_height)
+            gradient.setColorAt(0, QColor("#E53935"))  # rosu deschis
+            gradient.setColorAt(1, QColor("#C62828"))  # rosu inchis
+            brush = QBrush(gradient)
+            border_color = QColor("#B71C1C")
+        else: 
+            gradient = QLinearGradient(pixel_x, pixel_y, pixel_x, pixel_y + pixel_height)
+            gradient.setColorAt(0, QColor("#2196F3"))  # albastru deschis
+            gradient.setColorAt(1, QColor("#1565C0"))  # albastru inchis
+            brush = QBrush(gradient)
+            border_color = QColor("#0D47A1")
+
+        if piece.id == self.selected_piece_id:
+            border_color = QColor("#FFC107")
+            border_width = 4
+        else:
+            border_width = 2
+
+        painter.setPen(QPen(border_color, border_width))
+        painter.setBrush(brush)
+        painter.drawRoundedRect(
+            pixel_x, pixel_y,
+            pixel_width, pixel_height,
+            8, 8  
+        )
@@ -2,13 +2,16 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
                               QMessageBox, QMenuBar, QStatusBar)
 from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QAction
-from GameClasses import Board, PlayerType, Move, PieceType
+from GameClasses import Board, PlayerType
+from engine.process import EngineProcess
 from .board_widget import BoardWidget
 from .timer_widget import TimerWidget
 from .difficulty_dialog import DifficultyDialog
 from .start_dialog import StartDialog
 from .minimax_worker import MinimaxWorker
 from .piece_inventory_widget import PieceInventoryWidget
+from .search_stats_widget import SearchStatsWidget, format_action, format_summary
+from .action import Action, ActionType
 
 
 class TakGameWindow(QMainWindow):
@@ -19,13 +22,29 @@ class TakGameWindow(QMainWindow):
         self.board = Board()
         self.current_player = PlayerType.Human
         self.difficulty_depth = 3
+        self.move_time_limit = 5.0
+        # procese pentru cautarea paralela la radacina; 1 = cautare seriala
+        self.search_workers = 1
+        # 'root' imparte mutarile de la radacina, 'smp' cauta aceeasi pozitie cu tabela comuna
+        self.parallel_mode = 'root'
         self.computer_starts = True
+        # motorul cauta si cat timp se gandeste jucatorul (doar cautarea seriala)
+        self.pondering = True
+        self.last_search_stats = None
+        # rezultatele unei cautari pornite intr-un joc anterior sau pentru o alta pozitie se ignora
+        self.game_id = 0
+        self.search_generation = 0
+        self.current_worker = None
         self.thread_pool = QThreadPool()
+        # motorul ruleaza intr-un proces separat, ca animatiile si ceasul sa nu se blocheze
+        self.engine = EngineProcess()
 
         self._setup_ui()
         self._apply_stylesheet()
 
         self._show_start_dialog()
+        # pornit abia dupa dialog, ca iesirea din dialog sa nu lase procesul motorului in urma
+        self.engine.start()
 
         self.new_game()
 
@@ -58,6 +77,10 @@ class TakGameWindow(QMainWindow):
         self.inventory_widget.pieceTypeSelected.connect(self._on_piece_type_selected)
         right_panel.addWidget(self.inventory_widget)
 
+        self.stats_widget = SearchStatsWidget()
+        self.stats_widget.setVisible(False)
+        right_panel.addWidget(self.stats_widget)
+
         right_panel.addStretch()
 
         main_layout.addLayout(right_panel)
@@ -81,6 +104,23 @@ class TakGameWindow(QMainWindow):
         difficulty_action.triggered.connect(self._show_difficulty_dialog)
         game_menu.addAction(difficulty_action)
 
+        self.move_now_action = QAction("Muta acum", self)
+        self.move_now_action.setShortcut("Ctrl+M")
+        self.move_now_action.setEnabled(False)
+        self.move_now_action.triggered.connect(self._move_now)
+        game_menu.addAction(self.move_now_action)
+
+        ponder_action = QAction("Gandire in timpul adversarului", self)
+        ponder_action.setCheckable(True)
+        ponder_action.setChecked(self.pondering)
+        ponder_action.toggled.connect(self._toggle_pondering)
+        game_menu.addAction(ponder_action)
+
+        stats_action = QAction("Statistici cautare", self)
+        stats_action.setCheckable(True)
+        stats_action.toggled.connect(self._toggle_stats_panel)
+        game_menu.addAction(stats_action)
+
         game_menu.addSeparator()
 
         exit_action = QAction("Iesire", self)
@@ -185,7 +225,10 @@ class TakGameWindow(QMainWindow):
 
     def _update_status_bar(self):
         if self.current_player == PlayerType.Human:
-            self.status_bar.showMessage("Randul tau")
+            if self.last_search_stats:
+                self.status_bar.showMessage(f"Randul tau  |  calculatorul: {format_summary(self.last_search_stats)}")
+            else:
+                self.status_bar.showMessage("Randul tau")
         elif self.current_player == PlayerType.Computer:
             self.status_bar.showMessage("Calculatorul gandeste...")
         else:
@@ -197,6 +240,7 @@ class TakGameWindow(QMainWindow):
 
         if not result:
             import sys
+            self.engine.close()
             sys.exit(0)
 
         settings = dialog.get_settings()
@@ -204,6 +248,9 @@ class TakGameWindow(QMainWindow):
         self.computer_starts = settings['computer_starts']
 
     def new_game(self):
+        self._cancel_search()
+        self.engine.stop_pondering()
+        self.game_id += 1
         self.board = Board()
         self.board_widget.set_board(self.board)
         self.board_widget.clear_selection()
@@ -211,6 +258,8 @@ class TakGameWindow(QMainWindow):
         self.inventory_widget.clear_selection()
         self.inventory_widget.update_counts(self.board.available_pieces, PlayerType.Human)
         self.timer_widget.reset()
+        self.last_search_stats = None
+        self.stats_widget.clear()
 
         if self.computer_starts:
             self.current_player = PlayerType.Computer
@@ -232,6 +281,14 @@ class TakGameWindow(QMainWindow):
                 "Schimbarea va fi aplicata în urmatorul joc."
             )
 
+    def _toggle_pondering(self, enabled):
+        self.pondering = enabled
+        if not enabled:
+            self.engine.stop_pondering()
+
+    def _toggle_stats_panel(self, visible):
+        self.stats_widget.setVisible(visible)
+
     def _show_about(self):
         QMessageBox.about(
             self,
@@ -275,11 +332,7 @@ class TakGameWindow(QMainWindow):
         if self.current_player != PlayerType.Human:
             return
 
-        piece = None
-        for p in self.board.pieces:
-            if p.id == piece_id:
-                piece = p
-                break
+        piece = self.board.get_piece(piece_id)
 
         if not piece:
             return
@@ -294,11 +347,7 @@ class TakGameWindow(QMainWindow):
         if self.current_player != PlayerType.Human:
             return
 
-        piece = None
-        for p in self.board.pieces:
-            if p.id == move.piece_id:
-                piece = p
-                break
+        piece = self.board.get_piece(move.piece_id)
 
         if not piece or piece.player != PlayerType.Human:
             return
@@ -324,42 +373,60 @@ class TakGameWindow(QMainWindow):
         self.board_widget.animate_move(move, after_animation)
 
     def _make_computer_move(self):
-        worker = MinimaxWorker(self.board, self.difficulty_depth)
+        self._cancel_search()
+        self.search_generation += 1
+        worker = MinimaxWorker(self.engine, self.board, self.difficulty_depth, self.move_time_limit,
+                               self.search_workers, self.parallel_mode,
+                               self.game_id, self.search_generation)
         worker.signals.finished.connect(self._on_computer_move_finished)
         worker.signals.error.connect(self._on_computer_move_error)
+        worker.signals.progress.connect(self._on_search_progress)
+        self.current_worker = worker
+        self.move_now_action.setEnabled(True)
         self.thread_pool.start(worker)
 
-    def _on_computer_move_finished(self, result_board):
-        print(f"\n[DEBUG COMPUTER] Mutare finalizata!")
-        print(f"[DEBUG COMPUTER] Board vechi: {len(self.board.pieces)} piese")
-        print(f"[DEBUG COMPUTER] Board nou: {len(result_board.pieces)} piese")
+    def _cancel_search(self):
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.current_worker = None
+        self.move_now_action.setEnabled(False)
 
-        for p in result_board.pieces:
-            player_name = "Human" if p.player == PlayerType.Human else "Computer"
-            type_name = "Flat" if p.type == PieceType.Flat else "Standing"
-            print(f"  - ID={p.id}, Player={player_name}, Type={type_name}, Pos=({p.x},{p.y})")
+    def _move_now(self):
+        if self.current_worker is not None:
+            self.current_worker.move_now()
 
-        move = self._find_move_difference(self.board, result_board)
+    def _on_search_progress(self, result, game_id, generation):
+        # o iteratie ramasa in coada de la o cautare anulata nu trebuie sa ajunga in jocul nou
+        if game_id != self.game_id or generation != self.search_generation:
+            return
+        if self.current_player != PlayerType.Computer:
+            return
+        best = format_action(result.action, self.board.size)
+        self.status_bar.showMessage(f"Calculatorul gandeste...  cea mai buna: {best} (scor {result.score})  |  "
+                                    f"{format_summary(result.stats)}")
+        self.stats_widget.update_result(result, self.board.size)
+
+    def _on_computer_move_finished(self, result, game_id, generation):
+        if game_id != self.game_id or generation != self.search_generation:
+            print(f"[DEBUG COMPUTER] Rezultat vechi ignorat (joc {game_id}, generatie {generation})")
+            return
+        self.current_worker = None
+        self.move_now_action.setEnabled(False)
 
-        if move:
-            print(f"[DEBUG COMPUTER] Detectat MOVEMENT: piece {move.piece_id} la ({move.new_x},{move.new_y})")
-            def after_animation():
-                self.board = result_board
-                self.board_widget.set_board(self.board)
-                self.inventory_widget.update_counts(self.board.available_pieces, PlayerType.Human)
+        print(f"\n[DEBUG COMPUTER] Mutare finalizata!")
+        print(f"[DEBUG COMPUTER] {result}")
 
-                finished, winner = self.board.check_finish()
-                if finished:
-                    self._handle_game_over(winner)
-                    return
+        self.last_search_stats = result.stats
+        self.stats_widget.update_result(result, self.board.size)
 
-                self.current_player = PlayerType.Human
-                self.timer_widget.set_current_player(self.current_player)
-                self._update_status_bar()
+        engine_action = result.action
+        if engine_action is None:
+            # calculatorul nu paseaza cat timp are actiuni legale
+            engine_action = next(self.board.generate_actions(PlayerType.Computer), None)
+        action = Action.from_engine_action(self.board, engine_action, PlayerType.Computer)
+        result_board = self.board if action is None else self.board.apply_action(engine_action, PlayerType.Computer)
 
-            self.board_widget.animate_move(move, after_animation)
-        else:
-            print(f"[DEBUG COMPUTER] Detectat PLACEMENT (nu e mutare)")
+        def after_move():
             self.board = result_board
             self.board_widget.set_board(self.board)
             self.inventory_widget.update_counts(self.board.available_pieces, PlayerType.Human)
@@ -372,21 +439,33 @@ class TakGameWindow(QMainWindow):
             self.current_player = PlayerType.Human
             self.timer_widget.set_current_player(self.current_player)
             self._update_status_bar()
+            if self.pondering and self.search_workers == 1:
+                self.engine.ponder(self.board)
+
+        if action is not None and action.action_type == ActionType.MOVEMENT:
+            print(f"[DEBUG COMPUTER] MOVEMENT: piece {action.move.piece_id} la ({action.move.new_x},{action.move.new_y})")
+            self.board_widget.animate_move(action.move, after_move)
+        else:
+            print(f"[DEBUG COMPUTER] {action}")
+            after_move()
 
     def _on_computer_move_error(self, error_msg):
+        self.current_worker = None
+        self.move_now_action.setEnabled(False)
         QMessageBox.critical(
             self,
             "Eroare",
             f"Eroare in calculul mutarii: {error_msg}"
         )
 
-    def _find_move_difference(self, old_board, new_board):
-        for old_piece, new_piece in zip(old_board.pieces, new_board.pieces):
-            if old_piece.x != new_piece.x or old_piece.y != new_piece.y:
-                return Move(old_piece.id, new_piece.x, new_piece.y)
-        return None
+    def closeEvent(self, event):
+        self._cancel_search()
+        self.thread_pool.waitForDone(1000)
+        self.engine.close()
+        super().closeEvent(event)
 
     def _handle_game_over(self, winner):
+        self.engine.stop_pondering()
         self.current_player = PlayerType.NoPlayer
         self.timer_widget.pause()
         self._update_status_bar()
@@ -1,29 +1,64 @@
+import threading
+
 from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
-from GameClasses import Minimax, PlayerType
 
 class WorkerSignals(QObject):
-    finished = pyqtSignal(object)
+    # (rezultat, id joc, generatie); fereastra ignora rezultatele vechi
+    finished = pyqtSignal(object, int, int)
     error = pyqtSignal(str)
+    # SearchResult-ul fiecarei iteratii complete (mutare, scor, adancime, varianta, contoare),
+    # cu id-ul jocului si generatia ca la finished
+    progress = pyqtSignal(object, int, int)
 
 class MinimaxWorker(QRunnable):
+    # client subtire: cautarea ruleaza in procesul motorului (engine.process.EngineProcess),
+    # firul asta doar asteapta pe conducta fara sa tina GIL-ul
 
-    def __init__(self, board, depth=3):
+    def __init__(self, engine, board, depth=3, time_budget=None, workers=1, parallel_mode='root',
+                 game_id=0, generation=0):
         super().__init__()
+        self.engine = engine
         self.board = board
         self.depth = depth
+        self.time_budget = time_budget
+        self.workers = workers
+        self.parallel_mode = parallel_mode
+        self.game_id = game_id
+        self.generation = generation
+        self.stop_event = threading.Event()
+        self.cancelled = False
+        # ultima iteratie completa; un apelant cu termen poate folosi mutarea de aici
+        self.latest_result = None
         self.signals = WorkerSignals()
 
+    def move_now(self):
+        # cautarea se opreste si intoarce cea mai buna mutare gasita pana acum
+        self.stop_event.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self.stop_event.set()
+
+    def _report_progress(self, result):
+        self.latest_result = result
+        if not self.cancelled:
+            self.signals.progress.emit(result, self.game_id, self.generation)
+
     def run(self):
         try:
-            result_board = Minimax.find_next_board(
+            result = self.engine.search(
                 self.board,
                 self.depth,
-                float('-inf'),
-                float('inf'),
-                True
+                self.time_budget,
+                True,
+                workers=self.workers,
+                parallel_mode=self.parallel_mode,
+                on_iteration=self._report_progress,
+                stop=self.stop_event
             )
-            self.signals.finished.emit(result_board)
+            if not self.cancelled:
+                self.signals.finished.emit(result, self.game_id, self.generation)
         except Exception as e:
             import traceback
             traceback.print_exc()
-            self.signals.error.emit(str(e))
\ No newline at end of file
+            self.signals.error.emit(str(e))
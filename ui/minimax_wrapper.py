@@ -1,6 +1,6 @@
 
 from GameClasses import Minimax, PlayerType, PieceType
-from .action import generate_all_actions, ActionType
+from .action import Action
 
 
 class MinimaxWithPlacement:
@@ -8,48 +8,15 @@ class MinimaxWithPlacement:
 
     @staticmethod
     def find_best_action(board, depth, player):
-        all_actions = generate_all_actions(board, player)
-
         player_name = "Human" if player == PlayerType.Human else "Computer"
-        print(f"\n[DEBUG AI] {player_name} find_best_action: {len(all_actions)} actiuni posibile")
 
-        if not all_actions:
-            print(f"[DEBUG AI] {player_name}: NU sunt actiuni disponibile!")
-            return None
-
-        best_action = None
-        best_score = float('-inf') if player == PlayerType.Computer else float('inf')
-
-        for action in all_actions:
-            temp_board = action.apply_to_board(board)
-            if temp_board is None:
-                continue
-
-            if depth > 1:
-                result_board = Minimax.find_next_board(
-                    temp_board,
-                    depth - 1,
-                    float('-inf'),
-                    float('inf'),
-                    player == PlayerType.Computer
-                )
-                score = result_board.evaluation_function()
-            else:
-                score = temp_board.evaluation_function()
-
-            if player == PlayerType.Computer:
-                if score > best_score:
-                    best_score = score
-                    best_action = action
-            else:
-                if score < best_score:
-                    best_score = score
-                    best_action = action
+        result = Minimax.find_best_result(board, depth, player == PlayerType.Computer)
+        best_action = Action.from_engine_action(board, result.action, player)
 
         if best_action:
-            print(f"[DEBUG AI] {player_name} alege: {best_action} (score={best_score})")
+            print(f"[DEBUG AI] {player_name} alege: {best_action} (score={result.score}, noduri={result.nodes})")
         else:
-            print(f"[DEBUG AI] {player_name}: Nu s-a gasit best_action, folosesc prima actiune")
+            print(f"[DEBUG AI] {player_name}: NU sunt actiuni disponibile!")
 
         return best_action
 
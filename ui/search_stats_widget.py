@@ -0,0 +1,118 @@
+from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from engine import notation
+
+
+def format_count(value):
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 1000:
+        return f"{value / 1000:.1f}k"
+    return str(int(value))
+
+
+def format_action(action, size):
+    # aceeasi notatie ca protocolul motorului, vezi engine.notation
+    if action is None:
+        return "-"
+    return notation.format_action(action, size)
+
+
+def format_pv(pv, size):
+    return " ".join(format_action(action, size) for action in pv)
+
+
+def format_summary(stats):
+    if not stats:
+        return ""
+    return (f"adancime {stats.get('depth', 0)}, {format_count(stats.get('nodes', 0))} noduri, "
+            f"{format_count(stats.get('nps', 0))} noduri/s, {stats.get('elapsed', 0):.2f} s")
+
+
+class SearchStatsWidget(QWidget):
+
+    FIELDS = [
+        ('depth', "Adancime"),
+        ('nodes', "Noduri"),
+        ('nps', "Noduri/s"),
+        ('evaluations', "Evaluari"),
+        ('cutoffs', "Taieri beta"),
+        ('first_move', "Taieri la prima mutare"),
+        ('tt', "Tabela (gasite/cautari)"),
+        ('ponder', "Gandire (nimerite/ratate)"),
+        ('elapsed', "Timp"),
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.value_labels = {}
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QGridLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(6)
+
+        title = QLabel("Statistici cautare")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title_font = QFont()
+        title_font.setBold(True)
+        title_font.setPointSize(12)
+        title.setFont(title_font)
+        layout.addWidget(title, 0, 0, 1, 2)
+
+        for row, (key, text) in enumerate(self.FIELDS, start=1):
+            layout.addWidget(QLabel(text), row, 0)
+            value = QLabel("-")
+            value.setAlignment(Qt.AlignmentFlag.AlignRight)
+            layout.addWidget(value, row, 1)
+            self.value_labels[key] = value
+
+        self.best_line_label = QLabel("")
+        self.best_line_label.setWordWrap(True)
+        layout.addWidget(self.best_line_label, len(self.FIELDS) + 1, 0, 1, 2)
+
+        self.iterations_label = QLabel("")
+        self.iterations_label.setStyleSheet("color: #757575;")
+        layout.addWidget(self.iterations_label, len(self.FIELDS) + 2, 0, 1, 2)
+
+        self.setLayout(layout)
+
+    def update_stats(self, stats):
+        if not stats:
+            self.clear()
+            return
+
+        cutoffs = stats.get('cutoffs')
+        first_move = stats.get('first_move_cutoffs')
+        probes = stats.get('tt_probes')
+        values = {
+            'depth': str(stats.get('depth', 0)),
+            'nodes': format_count(stats.get('nodes', 0)),
+            'nps': format_count(stats.get('nps', 0)),
+            'evaluations': '-' if stats.get('evaluations') is None else format_count(stats['evaluations']),
+            'cutoffs': '-' if cutoffs is None else format_count(cutoffs),
+            'first_move': f"{first_move / cutoffs:.0%}" if cutoffs else '-',
+            'tt': f"{format_count(stats.get('tt_hits', 0))}/{format_count(probes)}" if probes else '-',
+            'elapsed': f"{stats.get('elapsed', 0):.2f} s",
+            'ponder': (f"{stats['ponder_hits']}/{stats['ponder_misses']}"
+                       if 'ponder_hits' in stats else '-'),
+        }
+        for key, value in values.items():
+            self.value_labels[key].setText(value)
+
+        lines = [f"d{depth}: scor {score}, {format_count(nodes)} noduri, {elapsed:.2f} s"
+                 for depth, score, nodes, elapsed in stats.get('iterations', [])]
+        self.iterations_label.setText("\n".join(lines))
+
+    def update_result(self, result, size):
+        self.update_stats(result.stats)
+        self.best_line_label.setText(f"Mutare: {format_action(result.action, size)}, scor {result.score}\n"
+                                     f"Varianta: {format_pv(result.pv, size)}")
+
+    def clear(self):
+        for label in self.value_labels.values():
+            label.setText("-")
+        self.best_line_label.setText("")
+        self.iterations_label.setText("")